@@ -1,15 +1,427 @@
+import math
+import warnings
+import numpy as np
+
 h = 0.00001
 def df(f, x):
-    return (f(x+h)-f(x))/h 
+    return (f(x+h)-f(x))/h
+
+# Gauss–Kronrod 7-15 點節點與權重 (QUADPACK qk15)，依 [-1, 1] 由左至右排列
+# 奇數索引 (1, 3, ..., 13) 同時是 7 點 Gauss 節點
+_XGK = np.array([0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+                 0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+                 0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+                 0.207784955007898467600689403773245])
+_WGK = np.array([0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+                 0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+                 0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+                 0.204432940075298892414161999234649])
+_WGK_CENTER = 0.209482141084727828012999174891714
+_WG = np.array([0.129484966168869693270856496775094, 0.279705391489276667901467771423780,
+                0.381830050505118944950369775488975])
+_WG_CENTER = 0.417959183673469387755102040816327
+
+GK_NODES = np.concatenate([-_XGK, [0.0], _XGK[::-1]])
+GK_WEIGHTS = np.concatenate([_WGK, [_WGK_CENTER], _WGK[::-1]])
+G_WEIGHTS = np.concatenate([_WG, [_WG_CENTER], _WG[::-1]])
+
+class IntegrationWarning(UserWarning):
+    """細分層數用完仍未達到 rtol/atol 時發出的警告"""
+
+def _evaluate(f, x, vectorized=None):
+    """
+    在陣列 x 上一次計算 f
+    vectorized=None 時先嘗試把整個陣列丟給 f，失敗 (或形狀不對) 就退回逐點呼叫
+    """
+    x = np.asarray(x, dtype=float)
+    if vectorized is not False:
+        try:
+            y = np.asarray(f(x), dtype=float)
+            if y.shape == x.shape:
+                return y
+            if y.ndim == 0:
+                # 常數函數，例如 lambda x: 1
+                return np.full(x.shape, float(y))
+        except (TypeError, ValueError):
+            pass
+        if vectorized:
+            raise ValueError("f 無法在 NumPy 陣列上計算")
+    return np.array([f(t) for t in x.ravel().tolist()], dtype=float).reshape(x.shape)
+
+def _gauss_kronrod(f, a, b, vectorized=None):
+    """
+    對一批區間 [a[i], b[i]] 同時做 15 點 Kronrod 積分
+    回傳 (積分估計, 誤差估計)，所有節點只呼叫一次 f
+    """
+    center = (a + b) / 2
+    half = (b - a) / 2
+    x = center[:, None] + half[:, None] * GK_NODES[None, :]
+    y = _evaluate(f, x, vectorized)
+    kronrod = half * (y @ GK_WEIGHTS)
+    gauss = half * (y[:, 1::2] @ G_WEIGHTS)
+    return kronrod, np.abs(kronrod - gauss)
+
+def _quad_gk(f, a, b, rtol, atol, max_level, vectorized):
+    lo = np.array([a], dtype=float)
+    hi = np.array([b], dtype=float)
+    total_width = b - a
+    done_value = 0.0
+    done_error = 0.0
+    neval = 0
+    for _ in range(max_level):
+        value, error = _gauss_kronrod(f, lo, hi, vectorized)
+        neval += 15 * len(lo)
+        estimate = done_value + value.sum()
+        tol = max(atol, rtol * abs(estimate))
+        # 每個區間分到與寬度成正比的容許誤差
+        ok = error <= tol * (hi - lo) / total_width
+        done_value += value[ok].sum()
+        done_error += error[ok].sum()
+        if ok.all():
+            return done_value, done_error, neval, True
+        lo, hi = lo[~ok], hi[~ok]
+        mid = (lo + hi) / 2
+        lo, hi = np.concatenate([lo, mid]), np.concatenate([mid, hi])
+    # 超過細分層數：把剩下的區間直接用最後一次估計收尾
+    return done_value + value[~ok].sum(), done_error + error[~ok].sum(), neval, False
+
+def _quad_simpson(f, a, b, rtol, atol, max_level, vectorized):
+    m = (a + b) / 2
+    fa, fm, fb = _evaluate(f, np.array([a, m, b]), vectorized)
+    if not (math.isfinite(fa) and math.isfinite(fm) and math.isfinite(fb)):
+        # 端點奇異 (例如 1/sqrt(x) 在 0)：改用不取端點的 Gauss–Kronrod
+        value, error, neval, converged = _quad_gk(f, a, b, rtol, atol, max_level, vectorized)
+        return value, error, neval + 3, converged
+    lo, hi = np.array([a]), np.array([b])
+    flo, fmid, fhi = np.array([fa]), np.array([fm]), np.array([fb])
+    whole = (hi - lo) / 6 * (flo + 4 * fmid + fhi)
+    total_width = b - a
+    done_value = 0.0
+    done_error = 0.0
+    neval = 3
+    for _ in range(max_level):
+        mid = (lo + hi) / 2
+        # 每個區間的左右四分點放在同一批計算
+        quarters = np.concatenate([(lo + mid) / 2, (mid + hi) / 2])
+        fq = _evaluate(f, quarters, vectorized)
+        neval += len(quarters)
+        fl, fr = fq[:len(lo)], fq[len(lo):]
+        left = (mid - lo) / 6 * (flo + 4 * fl + fmid)
+        right = (hi - mid) / 6 * (fmid + 4 * fr + fhi)
+        diff = left + right - whole
+        estimate = done_value + (left + right).sum()
+        tol = max(atol, rtol * abs(estimate))
+        ok = np.abs(diff) <= 15 * tol * (hi - lo) / total_width
+        # Richardson 外插修正
+        done_value += (left + right + diff / 15)[ok].sum()
+        done_error += np.abs(diff[ok]).sum() / 15
+        if ok.all():
+            return done_value, done_error, neval, True
+        keep = ~ok
+        lo, mid, hi = lo[keep], mid[keep], hi[keep]
+        flo, fl, fmid, fr, fhi = flo[keep], fl[keep], fmid[keep], fr[keep], fhi[keep]
+        lo, hi = np.concatenate([lo, mid]), np.concatenate([mid, hi])
+        flo, fmid, fhi = np.concatenate([flo, fmid]), np.concatenate([fl, fr]), np.concatenate([fmid, fhi])
+        whole = np.concatenate([left[keep], right[keep]])
+    return done_value + (left + right)[~ok].sum(), done_error + np.abs(diff[~ok]).sum() / 15, neval, False
+
+def quad(f, a, b, method="gk", rtol=1e-10, atol=1e-12, max_level=50, vectorized=None, full_output=False):
+    """
+    自適應數值積分
+    method: "gk" (Gauss–Kronrod 7-15) 或 "simpson" (自適應辛普森，端點或中點的值不是有限數時改用 gk)
+    rtol/atol: 相對/絕對誤差容許值
+    每一層細分的所有節點一次送進 f (若 f 可以吃 NumPy 陣列)，否則逐點呼叫
+    full_output=True 時回傳 (積分值, 誤差估計, f 的計算次數, 是否收斂)
+    max_level 層細分後仍未達到 rtol/atol 時發出 IntegrationWarning
+    """
+    if a == b:
+        return (0.0, 0.0, 0, True) if full_output else 0.0
+    sign = 1.0
+    if a > b:
+        a, b, sign = b, a, -1.0
+    if method == "gk":
+        result = _quad_gk(f, float(a), float(b), rtol, atol, max_level, vectorized)
+    elif method == "simpson":
+        result = _quad_simpson(f, float(a), float(b), rtol, atol, max_level, vectorized)
+    else:
+        raise ValueError(f"未知的積分方法: {method}")
+    result = (sign * float(result[0]), float(result[1]), result[2], result[3])
+    if not result[3]:
+        warnings.warn(f"細分 {max_level} 層後仍未收斂，誤差估計 {result[1]:.3g}", IntegrationWarning, stacklevel=2)
+    return result if full_output else result[0]
+
 def integral(f, a, b):
-    x = a
-    area = 0
-    while x<b:
-        area += f(x)*h
-        x+=h
-    return area
+    return quad(f, a, b)
+
+class Antiderivative:
+    """
+    不定積分 F(x) = ∫_a^x f(t) dt 的累積積分表
+    在等距格點 a + k*step 上保存 F 與 f (前綴和)，查詢時用三次 Hermite 內插
+    查到表格外時一次往外擴充 (至少加倍)，所以遞增的大量查詢是均攤 O(1)
+    每一格先整批做一次 G7K15，誤差超過 rtol/atol 的格子再各自用自適應積分細分
+    """
+    def __init__(self, f, a, step=0.01, vectorized=None, rtol=1e-10, atol=1e-12):
+        self.f = f
+        self.a = float(a)
+        self.step = float(step)
+        self.vectorized = vectorized
+        self.rtol = rtol
+        self.atol = atol
+        self._kmin = 0  # 表格第一個格點的索引 (格點 = a + k*step)
+        self._F = np.zeros(1)
+        self._f = _evaluate(f, np.array([self.a]), vectorized)
+
+    def _cells(self, nodes):
+        cells, error = _gauss_kronrod(self.f, nodes[:-1], nodes[1:], self.vectorized)
+        for i in np.flatnonzero(error > np.maximum(self.atol, self.rtol * np.abs(cells))).tolist():
+            cells[i], error, _, converged = _quad_gk(self.f, float(nodes[i]), float(nodes[i + 1]),
+                                                     self.rtol, self.atol, 50, self.vectorized)
+            if not converged:
+                warnings.warn(f"[{nodes[i]:g}, {nodes[i + 1]:g}] 的積分未收斂，誤差估計 {error:.3g}",
+                              IntegrationWarning, stacklevel=4)
+        return cells, _evaluate(self.f, nodes, self.vectorized)
+
+    def _extend(self, kmin, kmax):
+        """確保表格涵蓋格點 kmin..kmax"""
+        lo = self._kmin
+        hi = self._kmin + len(self._F) - 1
+        if kmax > hi:
+            n = max(kmax - hi, len(self._F))
+            nodes = self.a + self.step * np.arange(hi, hi + n + 1)
+            cells, fvals = self._cells(nodes)
+            self._F = np.concatenate([self._F, self._F[-1] + np.cumsum(cells)])
+            self._f = np.concatenate([self._f, fvals[1:]])
+        if kmin < lo:
+            n = max(lo - kmin, len(self._F))
+            nodes = self.a + self.step * np.arange(lo - n, lo + 1)
+            cells, fvals = self._cells(nodes)
+            self._F = np.concatenate([self._F[0] - np.cumsum(cells[::-1])[::-1], self._F])
+            self._f = np.concatenate([fvals[:-1], self._f])
+            self._kmin = lo - n
+
+    def __call__(self, x):
+        t = (np.asarray(x, dtype=float) - self.a) / self.step
+        k = np.floor(t).astype(int)
+        self._extend(int(k.min()), int(k.max()) + 1)
+        i = k - self._kmin
+        s = t - k
+        s2 = s * s
+        s3 = s2 * s
+        # 三次 Hermite：兩端點的 F 值與斜率 f
+        result = ((2 * s3 - 3 * s2 + 1) * self._F[i] + (s3 - 2 * s2 + s) * self.step * self._f[i]
+                  + (-2 * s3 + 3 * s2) * self._F[i + 1] + (s3 - s2) * self.step * self._f[i + 1])
+        return float(result) if result.ndim == 0 else result
+
+class Dual:
+    """
+    前向模式自動微分用的截斷泰勒級數 (jet)
+    c[k] = f^(k)(x0) / k!，order=1 時就是一般的對偶數 a + b·ε
+    係數可以是 NumPy 陣列，一次對整批 x 求導
+    """
+    def __init__(self, coeffs):
+        self.c = list(coeffs)
+
+    @classmethod
+    def variable(cls, x, order=1):
+        """自變數 x：值為 x，一階導數為 1"""
+        return cls([x, 1.0] + [0.0] * (order - 1))
+
+    @property
+    def order(self):
+        return len(self.c) - 1
+
+    @property
+    def value(self):
+        return self.c[0]
+
+    def derivative(self, k=1):
+        """第 k 階導數"""
+        return self.c[k] * math.factorial(k)
+
+    def __repr__(self):
+        return f"Dual({self.c})"
+
+    def _lift(self, other):
+        if isinstance(other, Dual):
+            if other.order != self.order:
+                raise ValueError("Dual 的階數不一致")
+            return other
+        return Dual([other] + [0.0] * self.order)
+
+    def __neg__(self):
+        return Dual([-a for a in self.c])
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        other = self._lift(other)
+        return Dual([a + b for a, b in zip(self.c, other.c)])
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        other = self._lift(other)
+        return Dual([a - b for a, b in zip(self.c, other.c)])
+
+    def __rsub__(self, other):
+        return self._lift(other) - self
+
+    def __mul__(self, other):
+        if not isinstance(other, Dual):
+            return Dual([a * other for a in self.c])
+        a, b = self.c, self._lift(other).c
+        return Dual([sum(a[i] * b[k - i] for i in range(k + 1)) for k in range(len(a))])
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        if not isinstance(other, Dual):
+            return Dual([a / other for a in self.c])
+        a, b = self.c, self._lift(other).c
+        q = []
+        for k in range(len(a)):
+            q.append((a[k] - sum(q[i] * b[k - i] for i in range(k))) / b[0])
+        return Dual(q)
+
+    def __rtruediv__(self, other):
+        return self._lift(other) / self
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            return (other * self.log()).exp()
+        if isinstance(other, (int, float, np.integer, np.floating)) and other >= 0 and other == int(other):
+            # 非負整數次方用平方乘法，在 x=0 也成立
+            n = int(other)
+            result = self._lift(1.0)
+            base = self
+            while n:
+                if n & 1:
+                    result = result * base
+                base = base * base
+                n >>= 1
+            return result
+        a = self.c
+        p = [a[0] ** other]
+        for k in range(1, len(a)):
+            p.append(sum((other * i - (k - i)) * a[i] * p[k - i] for i in range(1, k + 1)) / (k * a[0]))
+        return Dual(p)
+
+    def __rpow__(self, other):
+        return (self * np.log(other)).exp()
+
+    def exp(self):
+        a = self.c
+        e = [np.exp(a[0])]
+        for k in range(1, len(a)):
+            e.append(sum(i * a[i] * e[k - i] for i in range(1, k + 1)) / k)
+        return Dual(e)
+
+    def log(self):
+        a = self.c
+        l = [np.log(a[0])]
+        for k in range(1, len(a)):
+            l.append((a[k] - sum(i * l[i] * a[k - i] for i in range(1, k)) / k) / a[0])
+        return Dual(l)
+
+    def _sin_cos(self):
+        a = self.c
+        s = [np.sin(a[0])]
+        c = [np.cos(a[0])]
+        for k in range(1, len(a)):
+            s.append(sum(i * a[i] * c[k - i] for i in range(1, k + 1)) / k)
+            c.append(-sum(i * a[i] * s[k - i] for i in range(1, k + 1)) / k)
+        return Dual(s), Dual(c)
+
+    def sin(self):
+        return self._sin_cos()[0]
+
+    def cos(self):
+        return self._sin_cos()[1]
+
+    def tan(self):
+        s, c = self._sin_cos()
+        return s / c
+
+    def sqrt(self):
+        return self ** 0.5
+
+    # 比較只看函數值，讓 if x < 1: ... 這類分段函數也能微分
+    def __lt__(self, other):
+        return self.c[0] < self._lift(other).c[0]
+
+    def __le__(self, other):
+        return self.c[0] <= self._lift(other).c[0]
+
+    def __gt__(self, other):
+        return self.c[0] > self._lift(other).c[0]
+
+    def __ge__(self, other):
+        return self.c[0] >= self._lift(other).c[0]
+
+    # 讓 np.sin(x)、np.exp(x) 等寫法直接作用在 Dual 上
+    _BINARY_UFUNCS = {np.add: ("__add__", "__radd__"), np.subtract: ("__sub__", "__rsub__"),
+                      np.multiply: ("__mul__", "__rmul__"), np.true_divide: ("__truediv__", "__rtruediv__"),
+                      np.power: ("__pow__", "__rpow__")}
+    _UNARY_UFUNCS = {np.negative: "__neg__", np.positive: "__pos__", np.exp: "exp", np.log: "log",
+                     np.sin: "sin", np.cos: "cos", np.tan: "tan", np.sqrt: "sqrt"}
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in Dual._UNARY_UFUNCS:
+            return getattr(inputs[0], Dual._UNARY_UFUNCS[ufunc])()
+        if ufunc in Dual._BINARY_UFUNCS:
+            name, rname = Dual._BINARY_UFUNCS[ufunc]
+            x, y = inputs
+            return getattr(x, name)(y) if isinstance(x, Dual) else getattr(y, rname)(x)
+        return NotImplemented
+
+def ad_df(f, x, order=1):
+    """
+    用前向模式自動微分計算 f 在 x 的 order 階導數 (沒有截斷誤差)
+    f 只能用四則運算、次方與 np.exp/np.log/np.sin/np.cos/np.tan/np.sqrt
+    x 可以是 NumPy 陣列，一次算出整批導數
+    """
+    y = f(Dual.variable(x, order))
+    if not isinstance(y, Dual):
+        return 0.0 * np.asarray(x, dtype=float)
+    d = y.derivative(order)
+    if np.ndim(x) == 0:
+        return d
+    # 導數是常數時 d 是純量，要展開成和 x 一樣的形狀
+    return np.broadcast_to(d, np.shape(x)).astype(float)
+
+def df_batch(f, x, method="central", h=None, vectorized=None):
+    """
+    在陣列 x 上一次算出 f'(x)
+    method="central": 中央差分，誤差 O(h^2)
+    method="richardson": 中央差分再做 Richardson 外插，誤差 O(h^4)
+    所有取樣點合併成一次 f 呼叫
+    """
+    x = np.asarray(x, dtype=float)
+    eps = np.finfo(float).eps
+    if method == "central":
+        step = eps ** (1 / 3) if h is None else h
+    elif method == "richardson":
+        step = eps ** (1 / 5) if h is None else h
+    else:
+        raise ValueError(f"未知的差分方法: {method}")
+    step = step * np.maximum(1.0, np.abs(x))
+    step = (x + step) - x  # 讓 x+step 可以精確表示
+    if method == "central":
+        y = _evaluate(f, np.stack([x + step, x - step]), vectorized)
+        return (y[0] - y[1]) / (2 * step)
+    y = _evaluate(f, np.stack([x + step, x - step, x + step / 2, x - step / 2]), vectorized)
+    d1 = (y[0] - y[1]) / (2 * step)
+    d2 = (y[2] - y[3]) / step
+    return (4 * d2 - d1) / 3
+
 def theorem1(f, x):
-    r = df(lambda x:integral(f, 0, x), x)
+    F = Antiderivative(f, 0)
+    r = df(F, x)
     print('r=', r, 'f(x)=', f(x))
     print('abs(r-f(x))<0.01 = ', abs(r-f(x))<0.01)
     assert abs(r-f(x))<0.01
@@ -17,4 +429,8 @@ def f(x):
     return x**3
 print('df(f, 2)=', df(f, 2))
 print('integral(f, 0, 2)=', integral(f, 0, 2))
+value, error, neval, converged = quad(f, 0, 2, method="simpson", full_output=True)
+print('quad(f, 0, 2, simpson)=', value, '誤差估計=', error, '計算次數=', neval)
+print('ad_df(f, 2)=', ad_df(f, 2), 'ad_df(f, 2, order=2)=', ad_df(f, 2, order=2))
+print('df_batch(f, [1, 2, 3])=', df_batch(f, [1, 2, 3], method="richardson"))
 theorem1(f, 2)
@@ -1,4 +1,5 @@
 import cmath
+import numpy as np
 p = 1
 q = -2
 r = 3
@@ -11,6 +12,41 @@ def find_roots(x, y, z):
         sol1 = -y / (2 * x)
         sol2 = sol1
     return sol1, sol2
-ans1, ans2 = find_roots(p, q, r)
-print("第一根 =", ans1)
-print("第二根 =", ans2)
+def find_roots_batch(a, b, c, real_only=False):
+    """
+    一次解整批二次方程式 a x^2 + b x + c = 0 (a, b, c 為可廣播的陣列)
+    使用不會相消的公式：q = -(b + sign(b)·sqrt(Δ)) / 2，x1 = q / a，x2 = c / q
+    real_only=False：回傳兩個複數陣列 (x1, x2)
+    real_only=True：回傳 (x1, x2, mask)，mask 為 Δ >= 0 的位置，其餘根為 nan
+    a = 0 時退化為一次方程式，x1 = -c / b，x2 = nan
+    """
+    # 先轉成浮點數 (或複數) 再算 Δ，避免整數陣列在 b*b - 4ac 溢位
+    dtype = complex if any(np.iscomplexobj(v) for v in (a, b, c)) else float
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=dtype) for v in (a, b, c)))
+    delta = b * b - 4 * a * c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if real_only:
+            mask = delta >= 0
+            sqrt_delta = np.sqrt(np.where(mask, delta, np.nan))
+            sign = np.where(b >= 0, 1.0, -1.0)
+        else:
+            sqrt_delta = np.sqrt(delta.astype(complex))
+            # 讓 b 與 sqrt(Δ) 同方向，避免 b^2 >> 4ac 時相減
+            sign = np.where((np.conj(b) * sqrt_delta).real >= 0, 1.0, -1.0)
+        q = -(b + sign * sqrt_delta) / 2
+        x1 = q / a
+        x2 = np.where(q == 0, 0, c / q)
+        linear = a == 0
+        if linear.any():
+            x1 = np.where(linear, -c / b, x1)
+            x2 = np.where(linear, np.nan, x2)
+    if real_only:
+        return x1, x2, mask & ~(linear & (b == 0))
+    return x1, x2
+if __name__ == "__main__":
+    ans1, ans2 = find_roots(p, q, r)
+    print("第一根 =", ans1)
+    print("第二根 =", ans2)
+    x1, x2 = find_roots_batch([1, 1, 1], [-3, 1e8, 0], [2, 1, 1])
+    print("批次求根 x1 =", x1)
+    print("批次求根 x2 =", x2)
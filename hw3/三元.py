@@ -1,4 +1,5 @@
 import cmath
+import numpy as np
 
 def root3(a, b, c, d):
 
@@ -56,27 +57,143 @@ def root3(a, b, c, d):
 
     return tuple(roots)
 
+def _other_two_roots(x1, B, C):
+    """
+    已知 x^3 + A x^2 + B x + C 的一個根 x1 (x1 != 0)，
+    由 x2·x3 = -C/x1、x2 + x3 = (B - x2·x3)/x1 解出另外兩根
+    回傳 (x2, x3, 兩根是否為實數)
+    """
+    prod = -C / x1
+    half_sum = (B - prod) / x1 / 2
+    disc = half_sum**2 - prod
+    is_real = disc >= 0
+    w = half_sum + np.where(half_sum >= 0, 1, -1) * np.sqrt(np.maximum(disc, 0))
+    imag = np.sqrt(np.maximum(-disc, 0))
+    x2 = np.where(is_real, w, half_sum + 1j * imag)
+    x3 = np.where(is_real, np.where(w != 0, prod / np.where(w != 0, w, 1), 0), half_sum - 1j * imag)
+    return x2, x3, is_real
+
+def root3_batch(a, b, c, d, real_only=False):
+    """
+    一次解整批三次方程式 a x^3 + b x^2 + c x + d = 0 (係數為可廣播的實數陣列)
+    回傳形狀為 (..., 3) 的複數陣列；三個實根 (判別式 < 0) 時用三角函數 (Viète) 公式，
+    結果不會帶多餘的虛部；只有一個實根時它排在第一個
+    a = 0 退化為二次、a = b = 0 退化為一次，用不到的位置填 nan
+    real_only=True 時回傳 (實根陣列, mask)，非實根的位置為 nan，mask 為 False
+    """
+    a, b, c, d = (np.asarray(v, dtype=float) for v in np.broadcast_arrays(a, b, c, d))
+    shape = a.shape
+    a, b, c, d = (v.ravel() for v in (a, b, c, d))
+    roots = np.full((a.size, 3), complex(np.nan, np.nan))
+    real = np.zeros((a.size, 3), dtype=bool)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # 1. 一般情況：化為缺項三次式 t^3 + p t + q = 0，x = t - b/(3a)
+        idx = np.nonzero(a != 0)[0]
+        if idx.size:
+            A, B, C = b[idx] / a[idx], c[idx] / a[idx], d[idx] / a[idx]
+            shift = A / 3
+            p = B - A * shift
+            q = 2 * shift**3 - shift * B + C
+            disc = (q / 2)**2 + (p / 3)**3
+
+            # 1a. 判別式 < 0：三個相異實根，t_k = m cos(θ - 2πk/3)
+            three = disc < 0
+            if three.any():
+                pp, qq = p[three], q[three]
+                m = 2 * np.sqrt(-pp / 3)
+                theta = np.arccos(np.clip(3 * qq / (pp * m), -1, 1)) / 3
+                x = m[:, None] * np.cos(theta[:, None] - 2 * np.pi / 3 * np.arange(3)) - shift[three, None]
+                # 絕對值最大的根最準；另外兩根由根與係數關係重算，避免 a 很小時相消
+                # (係數極端時判別式可能判斷錯，所以重算的兩根仍要檢查是否為實根)
+                big = x[np.arange(len(x)), np.argmax(np.abs(x), axis=1)]
+                x2, x3, pair_is_real = _other_two_roots(big, B[three], C[three])
+                rows = idx[three]
+                roots[rows] = np.stack([big, x2, x3], axis=1)
+                ordered = np.argsort(roots[rows].real, axis=1)
+                roots[rows] = np.where(pair_is_real[:, None], np.take_along_axis(roots[rows], ordered, axis=1), roots[rows])
+                real[rows, 0] = True
+                real[rows, 1:] = pair_is_real[:, None]
+
+            # 1b. 判別式 >= 0：Cardano，選 u^3 與 q 反號避免相消
+            one = ~three
+            if one.any():
+                pp, qq, dd = p[one], q[one], disc[one]
+                u = np.cbrt(-qq / 2 - np.where(qq >= 0, 1, -1) * np.sqrt(dd))
+                v = np.where(u != 0, -pp / (3 * u), 0)
+                s = shift[one]
+                x1 = u + v - s
+                pair_real = -(u + v) / 2 - s
+                pair_imag = np.where(dd == 0, 0, np.sqrt(3) / 2 * (u - v))
+                pair_is_real = dd == 0
+                x2, x3 = pair_real + 1j * pair_imag, pair_real - 1j * pair_imag
+                # 同樣由絕對值較大的一方，用根與係數關係重算較小的一方
+                mod2 = pair_real**2 + pair_imag**2
+                dominant = (x1 * x1 >= mod2) & (x1 != 0)
+                y2, y3, y_real = _other_two_roots(np.where(dominant, x1, 1), B[one], C[one])
+                x2 = np.where(dominant, y2, x2)
+                x3 = np.where(dominant, y3, x3)
+                pair_is_real = np.where(dominant, y_real, pair_is_real)
+                x1 = np.where(dominant | (mod2 == 0), x1, -C[one] / mod2)
+                rows = idx[one]
+                roots[rows, 0] = x1
+                roots[rows, 1] = x2
+                roots[rows, 2] = x3
+                real[rows, 0] = True
+                real[rows, 1:] = pair_is_real[:, None]
+
+        # 2. a = 0：二次方程式 b x^2 + c x + d = 0 (同樣用不相消的公式)
+        idx = np.nonzero((a == 0) & (b != 0))[0]
+        if idx.size:
+            bb, cc, dd = b[idx], c[idx], d[idx]
+            delta = cc * cc - 4 * bb * dd
+            sq = np.sqrt(delta.astype(complex))
+            qq = -(cc + np.where(cc * sq.real >= 0, 1, -1) * sq) / 2
+            roots[idx, 0] = qq / bb
+            roots[idx, 1] = np.where(qq == 0, 0, dd / qq)
+            real[idx, :2] = (delta >= 0)[:, None]
+
+        # 3. a = b = 0：一次方程式 c x + d = 0
+        idx = np.nonzero((a == 0) & (b == 0) & (c != 0))[0]
+        roots[idx, 0] = -d[idx] / c[idx]
+        real[idx, 0] = True
+
+    roots = roots.reshape(shape + (3,))
+    real = real.reshape(shape + (3,))
+    if real_only:
+        return np.where(real, roots.real, np.nan), real
+    return roots
+
 # --- 測試範例 ---
 
-# 範例 1: x^3 - 6x^2 + 11x - 6 = 0 (根應該是 1, 2, 3)
-print("範例 1 (實根 1, 2, 3):")
-r1 = root3(1, -6, 11, -6)
-for r in r1:
-    print(f"{r:.2f}") 
-    # 註：輸出可能會帶有極小的虛部 (如 1.00+0.00j)，這是浮點數運算的正常現象
+if __name__ == "__main__":
+    # 範例 1: x^3 - 6x^2 + 11x - 6 = 0 (根應該是 1, 2, 3)
+    print("範例 1 (實根 1, 2, 3):")
+    r1 = root3(1, -6, 11, -6)
+    for r in r1:
+        print(f"{r:.2f}") 
+        # 註：輸出可能會帶有極小的虛部 (如 1.00+0.00j)，這是浮點數運算的正常現象
+
+    print("-" * 20)
+
+    # 範例 2: x^3 - 1 = 0 (根是 1 和兩個複數根)
+    print("範例 2 (x^3 - 1 = 0):")
+    r2 = root3(1, 0, 0, -1)
+    for r in r2:
+        print(f"{r:.2f}")
 
-print("-" * 20)
+    print("-" * 20)
 
-# 範例 2: x^3 - 1 = 0 (根是 1 和兩個複數根)
-print("範例 2 (x^3 - 1 = 0):")
-r2 = root3(1, 0, 0, -1)
-for r in r2:
-    print(f"{r:.2f}")
+    # 範例 3: x^3 + x + 1 = 0 (一個實根，兩個複數根)
+    print("範例 3 (x^3 + x + 1 = 0):")
+    r3 = root3(1, 0, 1, 1)
+    for r in r3:
+        print(f"{r:.2f}")
 
-print("-" * 20)
+    print("-" * 20)
 
-# 範例 3: x^3 + x + 1 = 0 (一個實根，兩個複數根)
-print("範例 3 (x^3 + x + 1 = 0):")
-r3 = root3(1, 0, 1, 1)
-for r in r3:
-    print(f"{r:.2f}")
+    # 範例 4: 批次求解 (三個實根、一個實根、退化為二次)
+    print("範例 4 (批次):")
+    r4 = root3_batch([1, 1, 0], [-6, 0, 1], [11, 1, 0], [-6, 1, -4])
+    for row in r4:
+        print(", ".join(f"{r:.2f}" for r in row))
@@ -1,5 +1,20 @@
+import os
 import random
 import cmath
+import importlib.util
+import numpy as np
+
+def _load_module(name, path):
+    """依檔案路徑載入模組，不更動 sys.path"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# 低次多項式直接使用 hw2 / hw3 的公式解
+_HERE = os.path.dirname(os.path.abspath(__file__))
+find_roots = _load_module("二元根", os.path.join(_HERE, "..", "hw2", "二元根.py")).find_roots
+root3 = _load_module("三元", os.path.join(_HERE, "..", "hw3", "三元.py")).root3
 
 def evaluate_poly(coeffs, x):
     """
@@ -25,6 +40,84 @@ def evaluate_derivative(coeffs, x):
         result = result * x + (coeffs[i] * i)
     return result
 
+def evaluate_poly_and_derivative(coeffs, z, compensated=False):
+    """
+    一次霍納迴圈同時算出 P(z) 與 P'(z)
+    z 可以是純量或 NumPy 陣列 (例如整張複數平面網格)
+    compensated=True 時使用補償霍納法 (error-free transformation)，
+    把每一步乘法、加法的捨入誤差另外累積起來再補回，
+    結果相當於用兩倍精度計算，適合病態 (根很密集) 的多項式
+    """
+    if compensated:
+        return _compensated_horner(coeffs, z)
+    p = 0
+    dp = 0
+    for c in reversed(coeffs):
+        dp = dp * z + p
+        p = p * z + c
+    return p, dp
+
+# Dekker 分拆用的常數 2^27 + 1
+_SPLITTER = 134217729.0
+
+def _two_sum(a, b):
+    """a + b = s + e (精確)"""
+    s = a + b
+    t = s - a
+    return s, (a - (s - t)) + (b - t)
+
+def _split(a):
+    c = _SPLITTER * a
+    high = c - (c - a)
+    return high, a - high
+
+def _two_prod(a, b):
+    """a * b = p + e (精確)"""
+    p = a * b
+    ah, al = _split(a)
+    bh, bl = _split(b)
+    return p, al * bl - (((p - ah * bh) - al * bh) - ah * bl)
+
+def _complex_two_prod(ar, ai, br, bi):
+    """(ar + i ai)(br + i bi) = (r + i s) + 誤差 (er + i ei)"""
+    p1, e1 = _two_prod(ar, br)
+    p2, e2 = _two_prod(ai, bi)
+    p3, e3 = _two_prod(ar, bi)
+    p4, e4 = _two_prod(ai, br)
+    r, e5 = _two_sum(p1, -p2)
+    s, e6 = _two_sum(p3, p4)
+    return r, s, e1 - e2 + e5, e3 + e4 + e6
+
+def _compensated_horner(coeffs, z):
+    coeffs = np.asarray(coeffs)
+    z = np.asarray(z)
+    real = np.isrealobj(coeffs) and np.isrealobj(z)
+    coeffs = coeffs.astype(complex)
+    zr = z.real.astype(float)
+    zi = z.imag.astype(float)
+    zeros = np.zeros(zr.shape)
+    # p: P 的值，e: P 的誤差項；d: P' 的值，f: P' 的誤差項
+    pr, pi = zeros + coeffs[-1].real, zeros + coeffs[-1].imag
+    er, ei = zeros, zeros
+    dr, di = zeros, zeros
+    fr, fi = zeros, zeros
+    for c in coeffs[-2::-1]:
+        # P' <- P' z + P (P 的真值是 p + e)
+        qr, qi, tr, ti = _complex_two_prod(dr, di, zr, zi)
+        dr, s1 = _two_sum(qr, pr)
+        di, s2 = _two_sum(qi, pi)
+        fr, fi = (fr * zr - fi * zi) + tr + s1 + er, (fr * zi + fi * zr) + ti + s2 + ei
+        # P <- P z + c
+        qr, qi, tr, ti = _complex_two_prod(pr, pi, zr, zi)
+        pr, s1 = _two_sum(qr, c.real)
+        pi, s2 = _two_sum(qi, c.imag)
+        er, ei = (er * zr - ei * zi) + tr + s1, (er * zi + ei * zr) + ti + s2
+    p = (pr + er) + 1j * (pi + ei)
+    dp = (dr + fr) + 1j * (di + fi)
+    if real:
+        return p.real[()], dp.real[()]
+    return p[()], dp[()]
+
 def synthetic_division(coeffs, root):
     """
     綜合除法 (Synthetic Division) 用於降次 (Deflation)
@@ -44,74 +137,396 @@ def synthetic_division(coeffs, root):
         
     return new_coeffs
 
-def find_one_root_newton(coeffs, max_iter=1000, tol=1e-10):
+def evaluate_poly_derivatives(coeffs, z):
     """
-    使用牛頓法在複數平面上尋找單一根
+    一次霍納迴圈算出 P(z)、P'(z)、P''(z)
     """
-    # 隨機初始化一個複數起點 (避免 0，避免對稱陷阱)
-    z = complex(random.random(), random.random())
+    p = 0
+    dp = 0
+    half_ddp = 0
+    for c in reversed(coeffs):
+        half_ddp = half_ddp * z + dp
+        dp = dp * z + p
+        p = p * z + c
+    return p, dp, 2 * half_ddp
+
+def derivative_coeffs(coeffs):
+    """P'(x) 的係數 [c1, 2*c2, ..., n*cn]"""
+    return [i * coeffs[i] for i in range(1, len(coeffs))]
+
+def _newton_iterate(coeffs, z, max_iter, tol, detect_multiplicity, rng):
+    """find_one_root_newton 的迭代本體，回傳 (z, m)；重數估計錯誤時 z 為 None"""
+    n = len(coeffs) - 1
+    abs_coeffs = [abs(c) for c in coeffs]
+    eps = np.finfo(float).eps
+    m = 1
+    history = []
     
     for _ in range(max_iter):
-        p_val = evaluate_poly(coeffs, z)
+        p_val, p_deriv, p_second = evaluate_poly_derivatives(coeffs, z)
         
-        # 如果值已經夠小，視為找到根
-        if abs(p_val) < tol:
-            return z
-            
-        p_deriv = evaluate_derivative(coeffs, z)
+        # 如果值已經小到只剩捨入誤差，視為找到根
+        if abs(p_val) <= 4 * eps * evaluate_poly(abs_coeffs, abs(z)):
+            break
         
         # 避免導數為 0 (除以零錯誤)
         if p_deriv == 0:
             # 隨機擾動一下再試
-            z += complex(random.random() * 0.1, random.random() * 0.1)
+            z += complex(rng.random() * 0.1, rng.random() * 0.1)
             continue
-            
-        # 牛頓法迭代公式: z = z - P(z)/P'(z)
-        z = z - p_val / p_deriv
         
+        if detect_multiplicity:
+            # Ostrowski 重數估計；連續三次估計一致才採用，避免離根很遠時亂跳
+            denom = p_deriv * p_deriv - p_val * p_second
+            estimate = round((p_deriv * p_deriv / denom).real) if denom != 0 else 1
+            history = (history + [min(max(estimate, 1), n)])[-3:]
+            if len(history) == 3 and history[0] == history[1] == history[2]:
+                m = history[0]
+            
+        # 修正牛頓法迭代公式: z = z - m * P(z)/P'(z)
+        step = m * p_val / p_deriv
+        z = z - step
+        if abs(step) <= tol * max(1, abs(z)):
+            break
+    
+    if m > 1:
+        # m 重根是 P^(m-1) 的單根，在那裡做牛頓法可以修正到完整精度
+        d = coeffs
+        for _ in range(m - 1):
+            d = derivative_coeffs(d)
+        for _ in range(3):
+            d_val, d_deriv = evaluate_poly_and_derivative(d, z)
+            if d_deriv == 0:
+                break
+            z = z - d_val / d_deriv
+        # 檢查：真正的 m 重根處 |P| 只剩捨入誤差
+        if abs(evaluate_poly(coeffs, z)) > 8 * n * eps * evaluate_poly(abs_coeffs, abs(z)):
+            return None, m
+    return z, m
+
+def find_one_root_newton(coeffs, max_iter=1000, tol=1e-10, return_multiplicity=False, rng=None):
+    """
+    使用牛頓法在複數平面上尋找單一根
+    重根時 P 與 P' 同時為 0，一般牛頓法只有線性收斂，所以每一步用
+    m ≈ Re(P'^2 / (P'^2 - P P'')) 估計重根次數，改用修正牛頓法 z - m P/P'
+    找到 m 重根後，再對 P 的 m-1 階導數 (該處為單根) 做牛頓法修正到完整精度；
+    若修正後 P 不為 0 (估計錯誤)，就從原起點改用一般牛頓法重來
+    停止條件：步長 <= tol * max(1, |z|)，或 |P(z)| 已落在捨入誤差範圍內
+    return_multiplicity=True 時回傳 (根, 重數)
+    rng: random.Random 物件 (預設為 random 模組)，固定種子可以讓結果重現
+    """
+    if rng is None:
+        rng = random
+    # 隨機初始化一個複數起點 (避免 0，避免對稱陷阱)
+    z0 = complex(rng.random(), rng.random())
+    z, m = _newton_iterate(coeffs, z0, max_iter, tol, True, rng)
+    if z is None:
+        z, m = _newton_iterate(coeffs, z0, max_iter, tol, False, rng)
+    
+    if return_multiplicity:
+        return z, m
     return z
 
-def root(c):
+def initial_circles(coeffs):
     """
-    主函數：求 n 次多項式的根
+    Aberth 法的初始值 (Bini 的 Newton polygon 方法)
+    對點 (i, log|c_i|) 取上凸包，每一段 i..j 給出 j-i 個根的半徑
+    (|c_i| / |c_j|)^(1/(j-i))，也就是只看這段係數時的 Cauchy 界
+    這些根平均放在該半徑的圓上，比單一 Cauchy 上界的大圓收斂快很多
+    """
+    a = np.abs(np.asarray(coeffs, dtype=complex))
+    n = len(a) - 1
+    hull = []
+    for i in np.nonzero(a)[0]:
+        # 單調鏈：移除不在上凸包上的點
+        while len(hull) >= 2:
+            i1, i2 = hull[-2], hull[-1]
+            if (np.log(a[i2]) - np.log(a[i1])) * (i - i1) <= (np.log(a[i]) - np.log(a[i1])) * (i2 - i1):
+                hull.pop()
+            else:
+                break
+        hull.append(i)
+    z = []
+    for i, j in zip(hull[:-1], hull[1:]):
+        k = j - i
+        radius = (a[i] / a[j]) ** (1 / k)
+        angles = 2 * np.pi * np.arange(k) / k + 2 * np.pi * i / n + 0.4
+        z.append(radius * np.exp(1j * angles))
+    # c0 = 0 (最低的幾個係數為 0) 表示有根在原點
+    z.append(np.zeros(hull[0], dtype=complex))
+    return np.concatenate(z)
+
+def _newton_ratio(coeffs, abs_coeffs, z, eps):
+    """
+    計算 P(z)/P'(z)，以及 |P(z)| 是否已落在捨入誤差範圍內
+    |z| > 1 時改用倒序多項式 R(w) = w^n P(1/w)，w = 1/z，避免高次方溢位：
+    P'(z)/P(z) = w (n - w R'(w)/R(w))
+    """
+    n = len(coeffs) - 1
+    ratio = np.empty(len(z), dtype=complex)
+    done = np.empty(len(z), dtype=bool)
+    inside = np.abs(z) <= 1
+    p, dp = evaluate_poly_and_derivative(coeffs, z[inside])
+    ratio[inside] = p / dp
+    done[inside] = np.abs(p) <= 4 * eps * evaluate_poly(abs_coeffs, np.abs(z[inside]))
+    w = 1 / z[~inside]
+    r, dr = evaluate_poly_and_derivative(coeffs[::-1], w)
+    bound = evaluate_poly(abs_coeffs[::-1], np.abs(w))
+    ratio[~inside] = 1 / (w * (n - w * dr / r))
+    done[~inside] = np.abs(r) <= 4 * eps * bound
+    return ratio, done
+
+def aberth(c, tol=1e-12, max_iter=200, z0=None, full_output=False):
+    """
+    Aberth–Ehrlich 法：所有根同時迭代 (不需要降次)
     c: 係數陣列 [c0, c1, ..., cn]
+    初始值由 initial_circles 決定 (或由 z0 指定 n 個起點)；
+    P、P' 以 NumPy 向量化的霍納法一次算出
+    每個根各自判斷收斂，已收斂的根不再更新
+    回傳 NumPy 複數陣列；full_output=True 時回傳 (根, 迭代次數, 是否全部收斂)
     """
-    # 複製一份係數，避免修改原始數據
-    current_coeffs = list(c)
-    
-    # 移除高次項為 0 的情況 (例如 [1, 2, 0, 0] 其實只是 1次多項式)
-    while len(current_coeffs) > 0 and current_coeffs[-1] == 0:
-        current_coeffs.pop()
-        
-    n = len(current_coeffs) - 1
+    coeffs = np.array(c, dtype=complex)
+    nz = np.nonzero(coeffs)[0]
+    n = nz[-1] if len(nz) else 0
     if n < 1:
-        return []
+        empty = np.array([], dtype=complex)
+        return (empty, 0, True) if full_output else empty
+    coeffs = coeffs[:n + 1]
 
+    if z0 is None:
+        z = initial_circles(coeffs)
+    else:
+        z = np.array(z0, dtype=complex)
+        if len(z) != n:
+            raise ValueError(f"z0 需要 {n} 個起點")
+    abs_coeffs = np.abs(coeffs)
+    eps = np.finfo(float).eps
+    active = np.arange(n)
+    iterations = 0
+
+    for iterations in range(1, max_iter + 1):
+        za = z[active]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio, done = _newton_ratio(coeffs, abs_coeffs, za, eps)
+            diff = za[:, None] - z[None, :]
+            diff[np.arange(len(active)), active] = np.inf
+            correction = ratio / (1 - ratio * (1 / diff).sum(axis=1))
+        correction[~np.isfinite(correction) | done] = 0
+        z[active] = za - correction
+        done |= np.abs(correction) <= tol * np.abs(za)
+        active = active[~done]
+        if len(active) == 0:
+            break
+    if full_output:
+        return z, iterations, len(active) == 0
+    return z
+
+def newton_deflation_roots(coeffs, rng=None):
+    """
+    逐一用牛頓法找根，再用綜合除法降次
+    coeffs: 已去掉高次零係數的係數陣列 [c0, c1, ..., cn]
+    回傳 [(根, 重數), ...]，m 重根一次降 m 次
+    """
+    current_coeffs = list(coeffs)
     roots = []
     
-    # 我們需要找 n 個根
-    for _ in range(n):
-        # 1. 找到一個根
-        r = find_one_root_newton(current_coeffs)
+    # 直到只剩常數項
+    while len(current_coeffs) > 1:
+        # 1. 找到一個根與它的重數
+        r, m = find_one_root_newton(current_coeffs, return_multiplicity=True, rng=rng)
         
         # 2. 修正數值誤差 (如果虚部極小，視為實數)
         if abs(r.imag) < 1e-8:
             r = r.real + 0j
             
-        roots.append(r)
+        roots.append((r, m))
         
-        # 3. 降次 (Deflation): P(x) <- P(x) / (x - r)
-        # 如果只剩常數項就不需要降次了
-        if len(current_coeffs) > 2:
+        # 3. 降次 (Deflation): P(x) <- P(x) / (x - r)^m
+        for _ in range(m):
             current_coeffs = synthetic_division(current_coeffs, r)
             
     return roots
 
+def companion_roots(coeffs):
+    """
+    用 companion 矩陣的特徵值求所有根
+    np.linalg.eigvals (LAPACK geev) 會先對矩陣做 balancing 再求特徵值
+    """
+    coeffs = np.asarray(coeffs)
+    n = len(coeffs) - 1
+    dtype = float if np.isrealobj(coeffs) else complex
+    C = np.zeros((n, n), dtype=dtype)
+    C[1:, :-1] = np.eye(n - 1)
+    C[:, -1] = -coeffs[:-1] / coeffs[-1]
+    return np.linalg.eigvals(C)
+
+def closed_form_roots(coeffs):
+    """1~3 次多項式的公式解 (2 次用 hw2 的 find_roots，3 次用 hw3 的 root3)"""
+    n = len(coeffs) - 1
+    if n == 1:
+        return [-coeffs[0] / coeffs[1]]
+    if n == 2:
+        return list(find_roots(coeffs[2], coeffs[1], coeffs[0]))
+    if n == 3:
+        return list(root3(coeffs[3], coeffs[2], coeffs[1], coeffs[0]))
+    raise ValueError("closed_form 只支援 3 次以下的多項式")
+
+def polish_roots(coeffs, roots, steps=3):
+    """
+    對原多項式做幾步牛頓法修正每個根
+    步長超過到最近另一個根距離的 1/3 時不採用，避免跳到別的根
+    """
+    coeffs = np.asarray(coeffs, dtype=complex)
+    abs_coeffs = np.abs(coeffs)
+    eps = np.finfo(float).eps
+    z = np.array(roots, dtype=complex)
+    if len(z) < 1:
+        return z
+    for _ in range(steps):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            ratio, done = _newton_ratio(coeffs, abs_coeffs, z, eps)
+        gap = np.abs(z[:, None] - z[None, :])
+        np.fill_diagonal(gap, np.inf)
+        ok = ~done & np.isfinite(ratio) & (np.abs(ratio) < gap.min(axis=1) / 3)
+        if not ok.any():
+            break
+        z[ok] -= ratio[ok]
+    return z
+
+# method="auto" 時，次數超過這個值改用 Aberth (O(n^2)/迭代)，否則用 companion 矩陣 (O(n^3))
+COMPANION_MAX_DEGREE = 150
+
+def root(c, method="auto", multiplicity=False, rng=None):
+    """
+    主函數：求 n 次多項式的根
+    c: 係數陣列 [c0, c1, ..., cn]
+    method:
+      "auto"        1~3 次用公式解，其餘依次數選 companion 或 aberth
+      "closed_form" 公式解 (hw2 find_roots / hw3 root3)，只支援 3 次以下
+      "companion"   companion 矩陣特徵值
+      "aberth"      Aberth–Ehrlich 同時迭代
+      "newton"      隨機起點牛頓法 + 綜合除法降次 (會偵測重根)
+    公式解與特徵值的結果會再用原多項式做幾步牛頓修正
+    multiplicity=True 時回傳 [(根, 重數), ...]，只有 "newton" 能偵測重數
+    ("auto" 會自動改用 "newton")
+    rng: "newton" 使用的 random.Random 物件，固定種子可以讓結果重現
+    """
+    # 複製一份係數，避免修改原始數據
+    current_coeffs = list(c)
+    
+    # 移除高次項為 0 的情況 (例如 [1, 2, 0, 0] 其實只是 1次多項式)
+    while len(current_coeffs) > 0 and current_coeffs[-1] == 0:
+        current_coeffs.pop()
+        
+    n = len(current_coeffs) - 1
+    if n < 1:
+        return []
+
+    if multiplicity:
+        if method not in ("auto", "newton"):
+            raise ValueError("multiplicity=True 只支援 method=\"newton\"")
+        return [(complex(r), m) for r, m in newton_deflation_roots(current_coeffs, rng)]
+
+    if method == "auto":
+        if n <= 3:
+            method = "closed_form"
+        elif n <= COMPANION_MAX_DEGREE:
+            method = "companion"
+        else:
+            method = "aberth"
+
+    if method == "closed_form":
+        roots = polish_roots(current_coeffs, closed_form_roots(current_coeffs))
+    elif method == "companion":
+        roots = polish_roots(current_coeffs, companion_roots(current_coeffs))
+    elif method == "aberth":
+        roots = aberth(current_coeffs)
+    elif method == "newton":
+        roots = [r for r, m in newton_deflation_roots(current_coeffs, rng) for _ in range(m)]
+    else:
+        raise ValueError(f"未知的求根方法: {method}")
+
+    # 修正數值誤差 (如果虚部極小，視為實數)
+    return [complex(r.real, 0) if abs(r.imag) < 1e-8 else complex(r) for r in roots]
+
+class RootTracker:
+    """
+    追蹤一系列係數緩慢變化的多項式的根 (例如每個時間步更新一次係數)
+    predictor：用前兩步的根做線性外插當作起點
+    corrector：從起點做 Aberth 迭代，通常幾次就收斂
+    若 corrector 在 max_iter 內沒收斂，就把係數的變化切成兩半分段追蹤 (continuation)，
+    最後才退回從頭求解並依最近距離對回原本的順序
+    各步回傳的根順序一致，可以直接當作根的軌跡
+    seed: 起點微擾用的亂數種子，固定後整個追蹤過程可以重現
+    """
+    def __init__(self, seed=None, tol=1e-12, max_iter=20, max_split=8):
+        self.rng = random.Random(seed)
+        self.tol = tol
+        self.max_iter = max_iter
+        self.max_split = max_split
+        self.reset()
+
+    def reset(self):
+        self.coeffs = None
+        self.roots = None
+        self._previous_roots = None
+        self.iterations = 0  # 上一次 update 總共用了幾次 Aberth 迭代
+
+    def _jitter(self, z):
+        # 兩個起點完全重合時 Aberth 的排斥項會除以零，所以加上極小的擾動
+        noise = [complex(self.rng.random() - 0.5, self.rng.random() - 0.5) for _ in range(len(z))]
+        return z + 1e-10 * (1 + np.abs(z)) * np.array(noise)
+
+    def _correct(self, start, target, guess, depth):
+        # guess 是 start 係數的根 (或其外插)，從 start 沿直線追到 target
+        z, iterations, converged = aberth(target, self.tol, self.max_iter, self._jitter(guess), True)
+        self.iterations += iterations
+        if converged or depth >= self.max_split:
+            return z if converged else None
+        # 係數變化太大：先追到中間點，再從中間點追完後半段
+        middle = (start + target) / 2
+        z = self._correct(start, middle, guess, depth + 1)
+        if z is None:
+            return None
+        return self._correct(middle, target, z, depth + 1)
+
+    def update(self, c):
+        """輸入新的係數 [c0, c1, ..., cn]，回傳依原順序排列的根 (NumPy 複數陣列)"""
+        coeffs = np.array(c, dtype=complex)
+        # 去掉最高次的 0 係數，讓存下來的係數與根的個數一致
+        nz = np.nonzero(coeffs)[0]
+        coeffs = coeffs[:(nz[-1] if len(nz) else 0) + 1]
+        self.iterations = 0
+        if self.roots is None or len(self.roots) != len(coeffs) - 1:
+            roots, self.iterations, _ = aberth(coeffs, self.tol, full_output=True)
+            self._previous_roots = None
+        else:
+            guess = self.roots
+            if self._previous_roots is not None:
+                guess = 2 * self.roots - self._previous_roots
+            roots = self._correct(self.coeffs, coeffs, guess, 0)
+            if roots is None:
+                roots = _match_order(guess, aberth(coeffs, self.tol))
+            self._previous_roots = self.roots
+        self.coeffs = coeffs
+        self.roots = roots
+        return roots
+
+def _match_order(reference, roots):
+    """把 roots 依最近距離一一對應到 reference 的順序 (貪婪法)"""
+    roots = list(roots)
+    ordered = []
+    for r in reference:
+        k = min(range(len(roots)), key=lambda i: abs(roots[i] - r))
+        ordered.append(roots.pop(k))
+    return np.array(ordered, dtype=complex)
+
 # --- 測試區 ---
 
 # 例子 1: x^2 - 2x + 1 = 0 (根是 1, 1) -> c = [1, -2, 1]
 c1 = [1, -2, 1]
 print(f"多項式 1 (x^2 - 2x + 1) 的根: {root(c1)}")
+print(f"多項式 1 的根與重數: {root(c1, multiplicity=True)}")
 
 # 例子 2: x^5 - 1 = 0 (5個根) -> c = [-1, 0, 0, 0, 0, 1]
 c2 = [-1, 0, 0, 0, 0, 1]
@@ -126,3 +541,14 @@ for r in roots_c2:
 # P(x) = x^2 + 1 -> [1, 0, 1] -> 根 i, -i
 c3 = [1, 0, 1]
 print(f"\n多項式 3 (x^2 + 1) 的根: {root(c3)}")
+
+# 例子 4: Aberth 法同時求出 x^5 - 1 的 5 個根
+print(f"\n多項式 2 (x^5 - 1) 的根 (Aberth):")
+for r in aberth(c2):
+    print(f"{r:.2f}")
+
+# 例子 5: 追蹤 x^2 - (1 + t) = 0 的根隨 t 的變化
+tracker = RootTracker(seed=0)
+for t in [0.0, 0.1, 0.2, 0.3]:
+    r = tracker.update([-(1 + t), 0, 1])
+    print(f"t={t:.1f} 根: {r[0]:.4f}, {r[1]:.4f} (迭代 {tracker.iterations} 次)")
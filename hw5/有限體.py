@@ -1,5 +1,58 @@
 import random
+from array import array
+import numpy as np
 from group import Group
+
+# p 小於這個值時，FiniteField 會預先建立 log / exp 表
+TABLE_LIMIT = 1 << 20
+# p 小於這個值時，FiniteField 會把所有元素預先建好共用
+INTERN_LIMIT = 1 << 16
+
+def prime_factors(n):
+    """n 的相異質因數 (試除法)"""
+    factors = []
+    d = 2
+    while d * d <= n:
+        if n % d == 0:
+            factors.append(d)
+            while n % d == 0:
+                n //= d
+        d += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+def primitive_root(p):
+    """GF(p) 乘法群的生成元 (原根)；p 不是質數時回傳 None"""
+    if p == 2:
+        return 1
+    factors = prime_factors(p - 1)
+    for g in range(2, p):
+        if pow(g, p - 1, p) != 1:
+            return None
+        if all(pow(g, (p - 1) // q, p) != 1 for q in factors):
+            return g
+    return None
+
+def build_log_tables(p):
+    """
+    以原根 g 建立 exp[i] = g^i 與 log[g^i] = i 兩張表 (array 儲存，每項 4 bytes)
+    p 不是質數時回傳 (None, None)
+    """
+    g = primitive_root(p)
+    if g is None:
+        return None, None
+    n = p - 1
+    exp_table = array("I", [0]) * n
+    log_table = array("I", [0]) * p
+    x = 1
+    for i in range(n):
+        if x == 1 and i > 0:
+            return None, None
+        exp_table[i] = x
+        log_table[x] = i
+        x = x * g % p
+    return exp_table, log_table
 class FiniteFieldAddGroup(Group):
     def __init__(self, p):
         self.p = p
@@ -21,18 +74,48 @@ class FiniteFieldAddGroup(Group):
     def random_generate(self):
         return random.randint(0, self.p - 1)
 class FiniteFieldMulGroup(Group):
-    def __init__(self, p):
+    def __init__(self, p, table_limit=TABLE_LIMIT):
         self.p = p
         self._identity = 1
+        self.exp_table, self.log_table = build_log_tables(p) if p < table_limit else (None, None)
 
     @property
     def identity(self):
         return self._identity
 
     def operation(self, a, b):
+        # 直接乘再取餘數：在 CPython 裡小整數的 a * b % p 比兩次查表還快
         return (a * b) % self.p
 
+    def divide(self, a, b):
+        if self.exp_table is None:
+            return (a * self.inverse(b)) % self.p
+        if not 0 <= a < self.p:
+            a %= self.p
+        if not 0 <= b < self.p:
+            b %= self.p
+        if b == 0:
+            raise ValueError("Zero has no multiplicative inverse")
+        if a == 0:
+            return 0
+        return self.exp_table[(self.log_table[a] - self.log_table[b]) % (self.p - 1)]
+
+    def power(self, val, n):
+        if self.exp_table is None:
+            return pow(val, n, self.p)
+        val %= self.p
+        if val == 0:
+            if n < 0:
+                raise ValueError("Zero has no multiplicative inverse")
+            return 0 if n > 0 else 1
+        return self.exp_table[self.log_table[val] * n % (self.p - 1)]
+
     def inverse(self, val):
+        val %= self.p
+        if self.exp_table is not None:
+            if val == 0:
+                raise ValueError("Zero has no multiplicative inverse")
+            return self.exp_table[-self.log_table[val] % (self.p - 1)]
         if val == 0:
             raise ValueError("Zero has no multiplicative inverse")
         t, new_t = 0, 1
@@ -51,12 +134,19 @@ class FiniteFieldMulGroup(Group):
     def random_generate(self):
         return random.randint(1, self.p - 1)
 class FiniteField:
-    def __init__(self, p):
+    def __init__(self, p, table_limit=TABLE_LIMIT):
+        """p < table_limit 時除法、反元素與次方改用 log / exp 查表 (乘法仍直接 a * b % p，比查表快)"""
         if p < 2:
             raise ValueError("p must be a prime number >= 2")
         self.p = p
         self.add_group = FiniteFieldAddGroup(p)
-        self.mul_group = FiniteFieldMulGroup(p)
+        self.mul_group = FiniteFieldMulGroup(p, table_limit)
+        self._montgomery = None
+        self._barrett = None
+        self._ntt_root = None
+        self._elements = None
+        if p < INTERN_LIMIT:
+            self._elements = _intern_elements(self)
 
     def add(self, a, b):
         return self.add_group.operation(a, b)
@@ -68,70 +158,873 @@ class FiniteField:
         return self.mul_group.operation(a, b)
 
     def divide(self, a, b):
-        return self.mul_group.operation(a, self.mul_group.inverse(b))
+        return self.mul_group.divide(a, b)
+
+    def pow(self, a, n, method="auto"):
+        """
+        a^n mod p
+        method: "auto" (查表或內建 pow)、"window" (滑動視窗 + 直接取餘數)、
+                "montgomery"、"barrett" (同樣的滑動視窗，但用對應的約簡)
+        """
+        if method == "auto":
+            return self.mul_group.power(a, n)
+        if n < 0:
+            a, n = self.multiplicative_inverse(a), -n
+        if method == "window":
+            p = self.p
+            return sliding_window_pow(a % p, n, lambda x, y: x * y % p, 1 % p)
+        if method == "montgomery":
+            ctx = self.montgomery()
+            return ctx.from_mont(ctx.pow(ctx.to_mont(a), n))
+        if method == "barrett":
+            return self.barrett().pow(a % self.p, n)
+        raise ValueError(f"Unknown pow method: {method}")
+
+    def montgomery(self):
+        """這個 field 的 MontgomeryContext (只建立一次)"""
+        if self._montgomery is None:
+            self._montgomery = MontgomeryContext(self.p)
+        return self._montgomery
+
+    def barrett(self):
+        """這個 field 的 BarrettContext (只建立一次)"""
+        if self._barrett is None:
+            self._barrett = BarrettContext(self.p)
+        return self._barrett
 
     def additive_inverse(self, val):
         return self.add_group.inverse(val)
 
-    def multiplicative_inverse(self, val):
+    def multiplicative_inverse(self, val, method="euclid"):
+        """method="fermat" 時改用 a^(p-2) (不需要除法，但通常比歐幾里得慢，見 benchmark)"""
+        if method == "fermat":
+            val %= self.p
+            if val == 0:
+                raise ValueError("Zero has no multiplicative inverse")
+            return pow(val, self.p - 2, self.p)
         return self.mul_group.inverse(val)
 
+    def batch_inverse(self, values):
+        return batch_inverse(values, self.p)
+
+    def array(self, values):
+        """把整數序列包成 FieldArray"""
+        return FieldArray(self, values)
+
+    def polynomial(self, coeffs):
+        """係數由低次到高次的 FieldPolynomial"""
+        return FieldPolynomial(self, coeffs)
+
     def element(self, val):
         """Wrap an int as a finite field element"""
-        return FiniteFieldElement(self, val)
+        return _make_element(self, val % self.p)
 class FiniteFieldElement:
-    def __init__(self, field, value):
-        self.field = field
-        self.value = value % self.field.p
+    """
+    GF(p) 的元素：只有 field 與 value 兩個欄位 (__slots__，沒有 __dict__)
+    p < INTERN_LIMIT 時每個值只會有一個實例，由 field._elements 共用
+    """
+    __slots__ = ("field", "value")
+
+    def __new__(cls, field, value):
+        return _make_element(field, value % field.p)
+
+    def __reduce__(self):
+        return (FiniteFieldElement, (self.field, self.value))
 
     def __repr__(self):
       return str(self.value)
 
     def __eq__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            return self.value == other.value and self.field == other.field
+        if type(other) is FiniteFieldElement:
+            return self.value == other.value and self.field is other.field
         return False
-    def __add__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            if self.field != other.field:
+
+    def __hash__(self):
+        return hash((self.field.p, self.value))
+
+    def _operand(self, other, symbol):
+        # 把另一個運算元轉成 [0, p) 內的整數；不同 field 的元素直接拒絕
+        if type(other) is FiniteFieldElement:
+            if other.field is not self.field:
                 raise ValueError("Cannot operate across fields")
-            return self.field.element(self.field.add(self.value, other.value))
+            return other.value
         if isinstance(other, int):
-            return self.field.element(self.field.add(self.value, other))
-        raise TypeError("Unsupported operand type for +")
+            return other % self.field.p
+        raise TypeError(f"Unsupported operand type for {symbol}")
+
+    def __add__(self, other):
+        field = self.field
+        if type(other) is FiniteFieldElement and other.field is field:
+            value = self.value + other.value
+        else:
+            value = self.value + self._operand(other, "+")
+        if value >= field.p:
+            value -= field.p
+        return _make_element(field, value)
     def __radd__(self, other):
         return self + other
     def __sub__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            if self.field != other.field:
-                raise ValueError("Cannot operate across fields")
-            return self.field.element(self.field.subtract(self.value, other.value))
-        if isinstance(other, int):
-            return self.field.element(self.field.subtract(self.value, other))
-        raise TypeError("Unsupported operand type for -")
+        field = self.field
+        if type(other) is FiniteFieldElement and other.field is field:
+            value = self.value - other.value
+        else:
+            value = self.value - self._operand(other, "-")
+        if value < 0:
+            value += field.p
+        return _make_element(field, value)
     def __rsub__(self, other):
         if isinstance(other, int):
-            return self.field.element(self.field.subtract(other, self.value))
+            return _make_element(self.field, (other - self.value) % self.field.p)
         raise TypeError("Unsupported operand type for -")
+    def __neg__(self):
+        return _make_element(self.field, -self.value % self.field.p)
+    def __pow__(self, n):
+        if not isinstance(n, int):
+            raise TypeError("Exponent must be an int")
+        return _make_element(self.field, self.field.pow(self.value, n))
     def __mul__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            if self.field != other.field:
-                raise ValueError("Cannot operate across fields")
-            return self.field.element(self.field.multiply(self.value, other.value))
-        if isinstance(other, int):
-            return self.field.element(self.field.multiply(self.value, other))
-        raise TypeError("Unsupported operand type for *")
+        field = self.field
+        if type(other) is FiniteFieldElement and other.field is field:
+            return _make_element(field, self.value * other.value % field.p)
+        return _make_element(field, self.value * self._operand(other, "*") % field.p)
     def __rmul__(self, other):
         return self * other
     def __truediv__(self, other):
-        if isinstance(other, FiniteFieldElement):
-            if self.field != other.field:
-                raise ValueError("Cannot operate across fields")
-            return self.field.element(self.field.divide(self.value, other.value))
+        field = self.field
+        return _make_element(field, field.mul_group.divide(self.value, self._operand(other, "/")))
+    def __rtruediv__(self, other):
         if isinstance(other, int):
-            return self.field.element(self.field.divide(self.value, other))
+            return _make_element(self.field, self.field.mul_group.divide(other, self.value))
         raise TypeError("Unsupported operand type for /")
+
+_new_element = object.__new__
+
+def _make_element(field, value):
+    """value 必須已在 [0, p) 內；小的 field 直接回傳共用的實例"""
+    cache = field._elements
+    if cache is not None:
+        return cache[value]
+    element = _new_element(FiniteFieldElement)
+    element.field = field
+    element.value = value
+    return element
+
+def _intern_elements(field):
+    elements = []
+    for value in range(field.p):
+        element = _new_element(FiniteFieldElement)
+        element.field = field
+        element.value = value
+        elements.append(element)
+    return elements
+
+# p 小於這個值時 (p-1)^2 < 2^62，FieldArray 可以用 int64 相乘再取餘數
+INT64_LIMIT = 1 << 31
+
+def batch_inverse(values, p):
+    """
+    Montgomery's trick：一次求整批元素的反元素
+    先算前綴乘積，只對總乘積做一次擴展歐幾里得，再倒著拆回每個反元素
+    共 3(n-1) 次乘法；任何一個元素為 0 就丟 ValueError
+    """
+    values = [v % p for v in values]
+    n = len(values)
+    if n == 0:
+        return []
+    prefix = [0] * n
+    acc = 1
+    for i, v in enumerate(values):
+        if v == 0:
+            raise ValueError("Zero has no multiplicative inverse")
+        prefix[i] = acc
+        acc = acc * v % p
+    inv = pow(acc, -1, p)
+    result = [0] * n
+    for i in range(n - 1, -1, -1):
+        result[i] = inv * prefix[i] % p
+        inv = inv * values[i] % p
+    return result
+
+class FieldArray:
+    """
+    GF(p) 上的 NumPy 陣列，支援逐元素 + - * / 與矩陣乘法 @
+    p < 2^31 時以 int64 儲存 (乘積不會溢位)，更大的 p 改用 object dtype 存 Python int
+    """
+    def __init__(self, field, values):
+        self.field = field
+        self.p = field.p
+        self.dtype = np.int64 if self.p < INT64_LIMIT else object
+        if isinstance(values, FieldArray):
+            values = values.data
+        data = np.asarray(values)
+        if self.dtype is object or data.dtype == object:
+            data = np.vectorize(lambda v: int(v) % self.p, otypes=[object])(data)
+            if self.dtype is not object:
+                data = data.astype(np.int64)
+        else:
+            data = np.mod(data.astype(np.int64), self.p)
+        self.data = data
+
+    def _wrap(self, data):
+        out = FieldArray.__new__(FieldArray)
+        out.field, out.p, out.dtype, out.data = self.field, self.p, self.dtype, data
+        return out
+
+    def _coerce(self, other):
+        if isinstance(other, FieldArray):
+            if other.field is not self.field and other.p != self.p:
+                raise ValueError("Cannot operate across fields")
+            return other.data
+        if type(other) is FiniteFieldElement:
+            if other.field is not self.field and other.field.p != self.p:
+                raise ValueError("Cannot operate across fields")
+            other = other.value
+        if isinstance(other, int):
+            return other % self.p
+        return FieldArray(self.field, other).data
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        item = self.data[index]
+        if isinstance(item, np.ndarray):
+            return self._wrap(item)
+        return self.field.element(int(item))
+
+    def __repr__(self):
+        return f"FieldArray({self.data.tolist()}, p={self.p})"
+
+    def tolist(self):
+        return self.data.tolist()
+
+    def __eq__(self, other):
+        return self.data == self._coerce(other)
+
+    def __add__(self, other):
+        return self._wrap((self.data + self._coerce(other)) % self.p)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return self._wrap((self.data - self._coerce(other)) % self.p)
+
+    def __rsub__(self, other):
+        return self._wrap((self._coerce(other) - self.data) % self.p)
+
+    def __neg__(self):
+        return self._wrap((-self.data) % self.p)
+
+    def __mul__(self, other):
+        return self._wrap(self.data * self._coerce(other) % self.p)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        if isinstance(other, (int, FiniteFieldElement)):
+            return self * self.field.multiplicative_inverse(self._coerce(other))
+        return self * self._wrap(self._coerce(other)).inverse()
+
     def __rtruediv__(self, other):
+        return self.inverse() * other
+
+    def __pow__(self, n):
+        if n < 0:
+            return self.inverse() ** (-n)
+        result = np.ones_like(self.data)
+        base = self.data
+        while n:
+            if n & 1:
+                result = result * base % self.p
+            base = base * base % self.p
+            n >>= 1
+        return self._wrap(result)
+
+    def inverse(self):
+        """
+        逐元素反元素：有 log / exp 表時直接查表，int64 時用 Fermat 的 a^(p-2)，
+        object dtype 則交給 batch_inverse
+        """
+        if np.any(self.data == 0):
+            raise ValueError("Zero has no multiplicative inverse")
+        group = self.field.mul_group
+        if group.exp_table is not None:
+            exp_table = np.frombuffer(group.exp_table, dtype=np.uint32)
+            log_table = np.frombuffer(group.log_table, dtype=np.uint32)
+            return self._wrap(exp_table[-log_table[self.data].astype(np.int64) % (self.p - 1)].astype(np.int64))
+        if self.dtype is not object:
+            return self ** (self.p - 2)
+        flat = batch_inverse(self.data.ravel().tolist(), self.p)
+        return self._wrap(np.array(flat, dtype=object).reshape(self.data.shape))
+
+    def __matmul__(self, other):
+        other = self._coerce(other)
+        a, b = self.data, other
+        if self.dtype is object:
+            return self._wrap(np.matmul(a, b) % self.p)
+        # 延遲取餘數：每次累加 chunk 個乘積，確保總和 < 2^63
+        chunk = max(1, ((1 << 63) - 1) // ((self.p - 1) ** 2 or 1))
+        k = a.shape[-1]
+        if chunk >= k:
+            return self._wrap(np.matmul(a, b) % self.p)
+        result = 0
+        for start in range(0, k, chunk):
+            stop = start + chunk
+            b_part = b[..., start:stop, :] if b.ndim > 1 else b[start:stop]
+            result = (result + np.matmul(a[..., start:stop], b_part) % self.p) % self.p
+        return self._wrap(result)
+
+    def __rmatmul__(self, other):
+        return FieldArray(self.field, other) @ self
+
+# 兩邊長度都超過這個值才用 NTT / Karatsuba，否則直接逐項相乘
+POLY_SCHOOLBOOK_LIMIT = 32
+# Karatsuba 遞迴到這個長度以下就交給 np.convolve (object dtype 用四分之一)
+KARATSUBA_CUTOFF = 256
+
+def _trim(coeffs):
+    nonzero = np.flatnonzero(coeffs)
+    return coeffs[:nonzero[-1] + 1] if len(nonzero) else coeffs[:0]
+
+def _schoolbook_mul(a, b, p):
+    if a.dtype == object or b.dtype == object:
+        return np.convolve(a.astype(object), b.astype(object)) % p
+    # int64：拆成高低 16 位元，各自 convolve 時累加不會溢位
+    a0, a1 = a & 0xFFFF, a >> 16
+    b0, b1 = b & 0xFFFF, b >> 16
+    low = np.convolve(a0, b0) % p
+    mid = (np.convolve(a0, b1) + np.convolve(a1, b0)) % p
+    high = np.convolve(a1, b1) % p
+    return ((high << 32) % p + (mid << 16) % p + low) % p
+
+def _karatsuba_mul(a, b, p):
+    if len(a) > len(b):
+        a, b = b, a
+    n, m = len(a), len(b)
+    if n <= (KARATSUBA_CUTOFF // 4 if b.dtype == object else KARATSUBA_CUTOFF):
+        return _schoolbook_mul(a, b, p)
+    if 2 * n <= m:
+        # 長度差太多時把長的那個切成 n 段，每段各做一次 Karatsuba
+        result = np.zeros(n + m - 1, dtype=b.dtype)
+        for start in range(0, m, n):
+            part = _karatsuba_mul(a, b[start:start + n], p)
+            result[start:start + len(part)] = (result[start:start + len(part)] + part) % p
+        return result
+    half = n // 2
+    a0, a1, b0, b1 = a[:half], a[half:], b[:half], b[half:]
+    z0 = _karatsuba_mul(a0, b0, p)
+    z2 = _karatsuba_mul(a1, b1, p)
+    z1 = _karatsuba_mul(_poly_add(a0, a1, p), _poly_add(b0, b1, p), p)
+    z1 = _poly_sub(_poly_sub(z1, z0, p), z2, p)
+    result = np.zeros(n + m - 1, dtype=b.dtype)
+    result[:len(z0)] = z0
+    result[2 * half:2 * half + len(z2)] = (result[2 * half:2 * half + len(z2)] + z2) % p
+    result[half:half + len(z1)] = (result[half:half + len(z1)] + z1) % p
+    return result
+
+def _poly_add(a, b, p):
+    if len(a) < len(b):
+        a, b = b, a
+    result = a.copy()
+    result[:len(b)] = (result[:len(b)] + b) % p
+    return result
+
+def _poly_sub(a, b, p):
+    size = max(len(a), len(b))
+    result = np.zeros(size, dtype=a.dtype if a.dtype == object else b.dtype)
+    result[:len(a)] = a
+    result[:len(b)] = (result[:len(b)] - b) % p
+    return result
+
+def _bit_reverse(n):
+    bits = n.bit_length() - 1
+    index = np.arange(n)
+    rev = np.zeros(n, dtype=np.int64)
+    for b in range(bits):
+        rev |= ((index >> b) & 1) << (bits - 1 - b)
+    return rev
+
+def _ntt(a, p, root, invert=False):
+    """
+    迭代式 NTT：先做位元反轉排列，每一層的蝴蝶運算一次處理整個陣列
+    a 長度為 2 的次方，root 為 GF(p) 的原根；p < 2^31 所以乘積放得進 int64
+    """
+    n = len(a)
+    a = a[_bit_reverse(n)]
+    length = 2
+    while length <= n:
+        half = length // 2
+        w_len = pow(root, (p - 1) // length, p)
+        if invert:
+            w_len = pow(w_len, p - 2, p)
+        twiddle = np.ones(half, dtype=np.int64)
+        k = 1
+        while k < half:
+            twiddle[k:2 * k] = twiddle[:k] * pow(w_len, k, p) % p
+            k *= 2
+        blocks = a.reshape(-1, length)
+        u = blocks[:, :half]
+        v = blocks[:, half:] * twiddle % p
+        a = np.concatenate(((u + v) % p, (u - v) % p), axis=1).reshape(n)
+        length *= 2
+    if invert:
+        a = a * pow(n, p - 2, p) % p
+    return a
+
+def _ntt_root(field, size):
+    """size (2 的次方) 整除 p-1 且 p < 2^31 時回傳原根，否則 None"""
+    p = field.p
+    if p >= INT64_LIMIT or (p - 1) % size:
+        return None
+    if field._ntt_root is None:
+        field._ntt_root = primitive_root(p) or 0
+    return field._ntt_root or None
+
+def _poly_mul(field, a, b):
+    p = field.p
+    if len(a) == 0 or len(b) == 0:
+        return a[:0]
+    if min(len(a), len(b)) <= POLY_SCHOOLBOOK_LIMIT:
+        return _schoolbook_mul(a, b, p)
+    out = len(a) + len(b) - 1
+    size = 1 << (out - 1).bit_length()
+    root = _ntt_root(field, size)
+    if root is None:
+        return _karatsuba_mul(a, b, p)
+    fa = np.zeros(size, dtype=np.int64)
+    fb = np.zeros(size, dtype=np.int64)
+    fa[:len(a)] = a
+    fb[:len(b)] = b
+    product = _ntt(fa, p, root) * _ntt(fb, p, root) % p
+    return _ntt(product, p, root, invert=True)[:out]
+
+def _poly_inverse(field, f, k):
+    """牛頓迭代求 g 使得 f g = 1 (mod x^k)，f[0] 不能為 0"""
+    p = field.p
+    g = np.array([field.multiplicative_inverse(int(f[0]))], dtype=f.dtype)
+    size = 1
+    while size < k:
+        size *= 2
+        fg = _poly_mul(field, f[:size], g)[:size]
+        correction = _poly_mul(field, g, _poly_sub(np.array([2], dtype=f.dtype), fg, p))
+        g = correction[:size]
+    return g[:k]
+
+class FieldPolynomial:
+    """
+    GF(p) 上的多項式，係數由低次到高次存在 NumPy 陣列 (dtype 同 FieldArray)
+    乘法：短的直接逐項乘；p - 1 被夠大的 2 的次方整除時用 NTT，否則用 Karatsuba
+    除法：除式與商都夠長時用牛頓迭代求倒數，否則長除法
+    """
+    def __init__(self, field, coeffs):
+        self.field = field
+        self.p = field.p
+        self.coeffs = _trim(np.atleast_1d(FieldArray(field, coeffs).data))
+
+    def _wrap(self, coeffs):
+        out = FieldPolynomial.__new__(FieldPolynomial)
+        out.field, out.p, out.coeffs = self.field, self.p, _trim(coeffs)
+        return out
+
+    def _coerce(self, other):
+        if isinstance(other, FieldPolynomial):
+            if other.field is not self.field and other.p != self.p:
+                raise ValueError("Cannot operate across fields")
+            return other.coeffs
+        if type(other) is FiniteFieldElement:
+            other = other.value
+        return FieldPolynomial(self.field, [other] if isinstance(other, int) else other).coeffs
+
+    @property
+    def degree(self):
+        """零多項式的次數記為 -1"""
+        return len(self.coeffs) - 1
+
+    def tolist(self):
+        return self.coeffs.tolist()
+
+    def __repr__(self):
+        return f"FieldPolynomial({self.tolist()}, p={self.p})"
+
+    def __eq__(self, other):
+        if not isinstance(other, FieldPolynomial):
+            return False
+        return self.p == other.p and np.array_equal(self.coeffs, other.coeffs)
+
+    def __add__(self, other):
+        return self._wrap(_poly_add(self.coeffs, self._coerce(other), self.p))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return self._wrap(_poly_sub(self.coeffs, self._coerce(other), self.p))
+
+    def __rsub__(self, other):
+        return self._wrap(_poly_sub(self._coerce(other), self.coeffs, self.p))
+
+    def __neg__(self):
+        return self._wrap(-self.coeffs % self.p)
+
+    def __mul__(self, other):
+        if type(other) is FiniteFieldElement:
+            other = other.value
         if isinstance(other, int):
-            return self.field.element(self.field.divide(other, self.value))
-        raise TypeError("Unsupported operand type for /")
+            return self._wrap(self.coeffs * (other % self.p) % self.p)
+        return self._wrap(_poly_mul(self.field, self.coeffs, self._coerce(other)))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __divmod__(self, other):
+        b = self._coerce(other)
+        if len(b) == 0:
+            raise ValueError("Polynomial division by zero")
+        a, p = self.coeffs, self.p
+        n, m = len(a), len(b)
+        if n < m:
+            return self._wrap(a[:0]), self._wrap(a.copy())
+        k = n - m + 1
+        if min(k, m) <= POLY_SCHOOLBOOK_LIMIT:
+            lead_inv = self.field.multiplicative_inverse(int(b[-1]))
+            r = a.copy()
+            q = np.zeros(k, dtype=a.dtype)
+            for i in range(k - 1, -1, -1):
+                c = int(r[i + m - 1]) * lead_inv % p
+                q[i] = c
+                if c:
+                    r[i:i + m] = (r[i:i + m] - c * b) % p
+            return self._wrap(q), self._wrap(r[:m - 1])
+        # rev(A) = rev(B) rev(Q) (mod x^k)，所以 rev(Q) = rev(A) / rev(B)
+        inv = _poly_inverse(self.field, b[::-1].copy(), k)
+        q = _poly_mul(self.field, a[::-1][:k].copy(), inv)[:k][::-1].copy()
+        r = _poly_sub(a, _poly_mul(self.field, b, q), p)[:m - 1]
+        return self._wrap(q), self._wrap(r)
+
+    def __floordiv__(self, other):
+        return divmod(self, other)[0]
+
+    def __mod__(self, other):
+        return divmod(self, other)[1]
+
+    def monic(self):
+        if self.degree < 0:
+            return self
+        return self * self.field.multiplicative_inverse(int(self.coeffs[-1]))
+
+    def gcd(self, other):
+        """最大公因式 (首項係數為 1)"""
+        a, b = self, self._wrap(self._coerce(other))
+        while b.degree >= 0:
+            a, b = b, a % b
+        return a.monic()
+
+    def __call__(self, x):
+        """在單一點求值 (Horner)；x 為 FiniteFieldElement 時回傳元素"""
+        if type(x) is FiniteFieldElement:
+            return _make_element(self.field, self(x.value))
+        p, x = self.p, x % self.p
+        acc = 0
+        for c in reversed(self.coeffs.tolist()):
+            acc = (acc * x + c) % p
+        return acc
+
+    def evaluate(self, points):
+        """多點求值：整批點一起跑 Horner，回傳 FieldArray"""
+        x = FieldArray(self.field, points).data
+        acc = np.zeros_like(x)
+        for c in reversed(self.coeffs.tolist()):
+            acc = (acc * x + c) % self.p
+        return FieldArray(self.field, acc)
+
+def _pack_gf2(M):
+    """GF(2) 矩陣每一列打包成 uint64 字組，第 j 行在字組 j // 64 的第 j % 64 位元"""
+    m, n = M.shape
+    words = max(1, (n + 63) // 64)
+    bits = np.zeros((m, words * 64), dtype=np.uint8)
+    bits[:, :n] = M
+    return np.packbits(bits, axis=1, bitorder="little").view("<u8")
+
+def _unpack_gf2(W, n):
+    bits = np.unpackbits(W.view(np.uint8), axis=1, bitorder="little")
+    return bits[:, :n].astype(np.int64)
+
+def _rref_gf2(M, ncols):
+    """p = 2：列打包後整列一起 XOR 做 Gauss-Jordan 消去"""
+    W = _pack_gf2(M)
+    pivots = []
+    r = 0
+    for col in range(ncols):
+        if r == len(W):
+            break
+        word, bit = col // 64, np.uint64(col % 64)
+        column = (W[:, word] >> bit) & np.uint64(1)
+        candidates = np.flatnonzero(column[r:])
+        if len(candidates) == 0:
+            continue
+        pivot = r + candidates[0]
+        if pivot != r:
+            W[[r, pivot]] = W[[pivot, r]]
+            column[[r, pivot]] = column[[pivot, r]]
+        mask = column.astype(bool)
+        mask[r] = False
+        W[mask] ^= W[r]
+        pivots.append(col)
+        r += 1
+    return _unpack_gf2(W, M.shape[1]), pivots
+
+def _rref(field, M, ncols=None):
+    """
+    Gauss-Jordan 化成簡化列梯形，只在前 ncols 行找主元；回傳 (R, 主元所在的行)
+    int64 時延遲取餘數：矩陣值不取餘數一路累加，只有快逼近 2^63 時才整個矩陣取一次，
+    當下要用到的主元列與主元行則隨時取餘數
+    """
+    p = field.p
+    M = M.copy()
+    rows, cols = M.shape
+    ncols = cols if ncols is None else ncols
+    if p == 2:
+        return _rref_gf2(M, ncols)
+    obj = M.dtype == object
+    step = (p - 1) ** 2
+    bound = p
+    pivots = []
+    r = 0
+    for col in range(ncols):
+        if r == rows:
+            break
+        column = M[r:, col] % p
+        candidates = np.flatnonzero(column)
+        if len(candidates) == 0:
+            continue
+        pivot = r + candidates[0]
+        if pivot != r:
+            M[[r, pivot]] = M[[pivot, r]]
+        inv = field.multiplicative_inverse(int(column[candidates[0]]))
+        M[r, col:] = M[r, col:] % p * inv % p
+        factor = -(M[:, col] % p) % p
+        factor[r] = 0
+        if not obj and bound + step >= 1 << 63:
+            M[:, col:] %= p
+            bound = p
+        M[:, col:] += factor[:, None] * M[r, col:]
+        bound += step
+        if obj:
+            M[:, col:] %= p
+        pivots.append(col)
+        r += 1
+    return M % p, pivots
+
+def _as_matrix(field, A):
+    M = FieldArray(field, A).data
+    if M.ndim != 2:
+        raise ValueError("Expected a 2-D matrix")
+    return M
+
+def matrix_rank(field, A):
+    """GF(p) 上矩陣的秩"""
+    return len(_rref(field, _as_matrix(field, A))[1])
+
+def matrix_solve(field, A, b):
+    """
+    解 A x = b (b 可以是向量或多個右手邊組成的矩陣)，回傳其中一組解
+    無解時丟 ValueError；有無限多解時自由變數取 0
+    """
+    M = _as_matrix(field, A)
+    B = FieldArray(field, b).data
+    vector = B.ndim == 1
+    B = B.reshape(len(B), -1)
+    if len(B) != len(M):
+        raise ValueError("Right-hand side has the wrong number of rows")
+    n = M.shape[1]
+    R, pivots = _rref(field, np.concatenate((M, B.astype(M.dtype)), axis=1), ncols=n)
+    rank = len(pivots)
+    if np.any(R[rank:, n:]):
+        raise ValueError("System has no solution")
+    x = np.zeros((n, B.shape[1]), dtype=R.dtype)
+    x[pivots] = R[:rank, n:]
+    return FieldArray(field, x[:, 0] if vector else x)
+
+def matrix_nullspace(field, A):
+    """零空間的一組基底，每一列是一個基底向量 (形狀為 (n - rank, n))"""
+    M = _as_matrix(field, A)
+    R, pivots = _rref(field, M)
+    n = M.shape[1]
+    free = [c for c in range(n) if c not in set(pivots)]
+    basis = np.zeros((len(free), n), dtype=R.dtype)
+    for i, f in enumerate(free):
+        basis[i, f] = 1
+        basis[i, pivots] = -R[:len(pivots), f] % field.p
+    return FieldArray(field, basis)
+
+def matrix_inverse(field, A):
+    """方陣的反矩陣；奇異矩陣丟 ValueError"""
+    M = _as_matrix(field, A)
+    n = len(M)
+    if M.shape != (n, n):
+        raise ValueError("Only square matrices have an inverse")
+    R, pivots = _rref(field, np.concatenate((M, np.eye(n, dtype=np.int64).astype(M.dtype)), axis=1), ncols=n)
+    if len(pivots) < n:
+        raise ValueError("Matrix is singular")
+    return FieldArray(field, R[:, n:])
+
+def sliding_window_pow(base, n, multiply, one, window=None):
+    """
+    從高位往低位的滑動視窗快速冪 (n >= 0)
+    只預先算奇數次方 base^1, base^3, ..., base^(2^w - 1)，
+    遇到 0 位元只平方，遇到 1 就吃下最長 w 位、結尾為 1 的視窗
+    multiply 為兩數相乘 (含約簡) 的函數，one 為乘法單位元 (同一個表示法)
+    """
+    if n < 0:
+        raise ValueError("Exponent must be non-negative")
+    if n == 0:
+        return one
+    bits = n.bit_length()
+    if window is None:
+        window = 1 if bits <= 8 else 3 if bits <= 64 else 4 if bits <= 256 else 5 if bits <= 1024 else 6
+    square = multiply(base, base)
+    odd_powers = [base]
+    for _ in range((1 << (window - 1)) - 1):
+        odd_powers.append(multiply(odd_powers[-1], square))
+    result = one
+    i = bits - 1
+    while i >= 0:
+        if not (n >> i) & 1:
+            result = multiply(result, result)
+            i -= 1
+            continue
+        j = max(i - window + 1, 0)
+        while not (n >> j) & 1:
+            j += 1
+        length = i - j + 1
+        for _ in range(length):
+            result = multiply(result, result)
+        result = multiply(result, odd_powers[((n >> j) & ((1 << length) - 1)) >> 1])
+        i = j - 1
+    return result
+
+class MontgomeryContext:
+    """
+    Montgomery 表示法：a 存成 aR mod p (R = 2^k > p，p 必須是奇數)
+    乘法用 REDC，只需要乘法、位元遮罩與位移，不用除以 p
+    一連串運算中值都留在 Montgomery 形式，只在頭尾做 to_mont / from_mont
+    """
+    def __init__(self, p):
+        if p % 2 == 0:
+            raise ValueError("Montgomery reduction needs an odd modulus")
+        self.p = p
+        self.k = p.bit_length()
+        self.mask = (1 << self.k) - 1
+        self.p_neg_inv = -pow(p, -1, 1 << self.k) & self.mask
+        self.r2 = (1 << (2 * self.k)) % p
+        self.one = (1 << self.k) % p
+
+    def reduce(self, t):
+        """REDC：t < pR 時回傳 t R^-1 mod p"""
+        m = ((t & self.mask) * self.p_neg_inv) & self.mask
+        u = (t + m * self.p) >> self.k
+        return u - self.p if u >= self.p else u
+
+    def to_mont(self, a):
+        return self.reduce((a % self.p) * self.r2)
+
+    def from_mont(self, a):
+        return self.reduce(a)
+
+    def multiply(self, a, b):
+        return self.reduce(a * b)
+
+    def add(self, a, b):
+        c = a + b
+        return c - self.p if c >= self.p else c
+
+    def subtract(self, a, b):
+        c = a - b
+        return c + self.p if c < 0 else c
+
+    def pow(self, a, n):
+        """a 與回傳值都是 Montgomery 形式"""
+        return sliding_window_pow(a, n, self.multiply, self.one)
+
+class BarrettContext:
+    """
+    Barrett 約簡：預先算 mu = floor(4^k / p)，
+    x < p^2 時 x mod p 只需要兩次乘法、位移與至多兩次減法
+    值維持一般表示法，不需要轉換
+    """
+    def __init__(self, p):
+        self.p = p
+        self.k = p.bit_length()
+        self.mu = (1 << (2 * self.k)) // p
+
+    def reduce(self, x):
+        q = ((x >> (self.k - 1)) * self.mu) >> (self.k + 1)
+        r = x - q * self.p
+        while r >= self.p:
+            r -= self.p
+        return r
+
+    def multiply(self, a, b):
+        return self.reduce(a * b)
+
+    def pow(self, a, n):
+        return sliding_window_pow(a, n, self.multiply, 1 % self.p)
+
+def benchmark(primes=None, chain=2000, repeat=3):
+    """
+    比較大質數下各種模乘法與次方的速度：
+    直接 %、Montgomery (整串留在 Montgomery 形式)、Barrett、內建 pow 與滑動視窗
+    """
+    import timeit
+    if primes is None:
+        primes = {"2^255-19": (1 << 255) - 19, "2^521-1": (1 << 521) - 1, "2^2203-1": (1 << 2203) - 1}
+    rng = random.Random(0)
+    for name, p in primes.items():
+        field = FiniteField(p)
+        mont, barrett = field.montgomery(), field.barrett()
+        a, b = rng.randrange(1, p), rng.randrange(1, p)
+        e = rng.randrange(p)
+
+        def chain_plain():
+            x = a
+            for _ in range(chain):
+                x = x * b % p
+            return x
+
+        def chain_montgomery():
+            x, y = mont.to_mont(a), mont.to_mont(b)
+            for _ in range(chain):
+                x = mont.multiply(x, y)
+            return mont.from_mont(x)
+
+        def chain_barrett():
+            x = a
+            for _ in range(chain):
+                x = barrett.multiply(x, b)
+            return x
+
+        assert chain_plain() == chain_montgomery() == chain_barrett()
+        results = {
+            f"{chain} 次乘法 %": chain_plain,
+            f"{chain} 次乘法 Montgomery": chain_montgomery,
+            f"{chain} 次乘法 Barrett": chain_barrett,
+            "pow 內建": lambda: field.pow(a, e),
+            "pow 滑動視窗 %": lambda: field.pow(a, e, method="window"),
+            "pow 滑動視窗 Montgomery": lambda: field.pow(a, e, method="montgomery"),
+            "pow 滑動視窗 Barrett": lambda: field.pow(a, e, method="barrett"),
+            "反元素 歐幾里得": lambda: field.multiplicative_inverse(a),
+            "反元素 Fermat": lambda: field.multiplicative_inverse(a, method="fermat"),
+        }
+        print(f"p = {name}")
+        for label, fn in results.items():
+            best = min(timeit.repeat(fn, number=1, repeat=repeat))
+            print(f"  {label:<24}{best * 1e3:10.3f} ms")
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,4 +1,7 @@
 import math
+import heapq
+from bisect import bisect_left, bisect_right
+import numpy as np
 
 class Point:
     def __init__(self, x, y):
@@ -32,10 +35,135 @@ class Point:
         self.x = center.x + (tx * cos_a - ty * sin_a)
         self.y = center.y + (tx * sin_a + ty * cos_a)
 
-class Line:
+class Transform:
+    """
+    3x3 齊次座標的仿射變換，translate / scale / rotate 依呼叫順序疊加 (新的變換作用在舊的之後)
+    每個方法都回傳 self，可以串接：Transform().rotate(30).translate(1, 0)
+    """
+    def __init__(self, matrix=None):
+        self.matrix = np.eye(3) if matrix is None else np.array(matrix, dtype=float)
+
+    def __repr__(self):
+        return f"Transform({self.matrix.tolist()})"
+
+    def _then(self, a, b, c, d, e, f):
+        # 新變換 [[a, b, e], [c, d, f]] 左乘到目前的矩陣
+        m = self.matrix
+        self.matrix = np.array([
+            [a * m[0, 0] + b * m[1, 0], a * m[0, 1] + b * m[1, 1], a * m[0, 2] + b * m[1, 2] + e],
+            [c * m[0, 0] + d * m[1, 0], c * m[0, 1] + d * m[1, 1], c * m[0, 2] + d * m[1, 2] + f],
+            [0.0, 0.0, 1.0],
+        ])
+        return self
+
+    def then(self, other):
+        """先做 self 再做 other"""
+        self.matrix = other.matrix @ self.matrix
+        return self
+
+    def translate(self, dx, dy):
+        return self._then(1, 0, 0, 1, dx, dy)
+
+    def scale(self, factor, center=None):
+        cx, cy = (0, 0) if center is None else (center.x, center.y)
+        return self._then(factor, 0, 0, factor, cx * (1 - factor), cy * (1 - factor))
+
+    def rotate(self, angle_deg, center=None):
+        cx, cy = (0, 0) if center is None else (center.x, center.y)
+        rad = math.radians(angle_deg)
+        cos_a = math.cos(rad)
+        sin_a = math.sin(rad)
+        return self._then(cos_a, -sin_a, sin_a, cos_a,
+                          cx - (cx * cos_a - cy * sin_a), cy - (cx * sin_a + cy * cos_a))
+
+    def scale_factor(self):
+        """線性部分對長度的放大倍率 (只對等比例縮放 + 旋轉有意義，圓的半徑用這個)"""
+        m = self.matrix
+        return math.sqrt(abs(m[0, 0] * m[1, 1] - m[0, 1] * m[1, 0]))
+
+    def apply_point(self, p):
+        m = self.matrix
+        return Point(m[0, 0] * p.x + m[0, 1] * p.y + m[0, 2], m[1, 0] * p.x + m[1, 1] * p.y + m[1, 2])
+
+    def move_point(self, p):
+        """直接修改 p 的座標 (其他地方持有的同一個 Point 也會跟著動)"""
+        m = self.matrix
+        p.x, p.y = m[0, 0] * p.x + m[0, 1] * p.y + m[0, 2], m[1, 0] * p.x + m[1, 1] * p.y + m[1, 2]
+
+    def apply_xy(self, xy):
+        """對 (n, 2) 座標陣列一次套用整個變換"""
+        m = self.matrix
+        return xy @ m[:2, :2].T + m[:2, 2]
+
+class _LazyTransform:
+    """
+    Line / Circle / Triangle 共用：translate / scale / rotate 只把變換疊進 _pending，
+    讀取座標時才一次套用到所有點
+    center 為 None 時使用 _default_center()，Line 是原點，Circle 是圓心，Triangle 是重心
+    """
+    _pending = None
+
+    def _transform(self):
+        if self._pending is None:
+            self._pending = Transform()
+        return self._pending
+
+    def _current(self, p):
+        # 不觸發套用，直接算出某個原始點目前的位置
+        return p if self._pending is None else self._pending.apply_point(p)
+
+    def _default_center(self):
+        return None
+
+    def _flush(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._apply(pending)
+
+    def transform(self, t):
+        self._transform().then(t)
+
+    def translate(self, dx, dy):
+        self._transform().translate(dx, dy)
+
+    def scale(self, factor, center=None):
+        if center is None:
+            center = self._default_center()
+        self._transform().scale(factor, center)
+
+    def rotate(self, angle_deg, center=None):
+        if center is None:
+            center = self._default_center()
+        self._transform().rotate(angle_deg, center)
+
+class Line(_LazyTransform):
     def __init__(self, p1, p2):
-        self.p1 = Point(p1.x, p1.y) 
-        self.p2 = Point(p2.x, p2.y)
+        self._p1 = Point(p1.x, p1.y) 
+        self._p2 = Point(p2.x, p2.y)
+
+    @property
+    def p1(self):
+        self._flush()
+        return self._p1
+
+    @p1.setter
+    def p1(self, p):
+        self._flush()
+        self._p1 = p
+
+    @property
+    def p2(self):
+        self._flush()
+        return self._p2
+
+    @p2.setter
+    def p2(self, p):
+        self._flush()
+        self._p2 = p
+
+    def _apply(self, t):
+        t.move_point(self._p1)
+        t.move_point(self._p2)
 
     def get_coeffs(self):
         A = self.p1.y - self.p2.y
@@ -46,65 +174,279 @@ class Line:
     def __repr__(self):
         return f"Line({self.p1}, {self.p2})"
 
+class Circle(_LazyTransform):
+    def __init__(self, center, radius):
+        self._center = Point(center.x, center.y)
+        self._radius = radius
+
+    @property
+    def center(self):
+        self._flush()
+        return self._center
+
+    @center.setter
+    def center(self, p):
+        self._flush()
+        self._center = p
+
+    @property
+    def radius(self):
+        self._flush()
+        return self._radius
+
+    @radius.setter
+    def radius(self, r):
+        self._flush()
+        self._radius = r
+
+    def _default_center(self):
+        return self._current(self._center)
+
+    def _apply(self, t):
+        t.move_point(self._center)
+        self._radius *= t.scale_factor()
+
+    def __repr__(self):
+        return f"Circle(Center={self.center}, r={self.radius:.2f})"
+
+class Triangle(_LazyTransform):
+    def __init__(self, p1, p2, p3):
+        self._points = [Point(p1.x, p1.y), Point(p2.x, p2.y), Point(p3.x, p3.y)]
+
+    @property
+    def points(self):
+        self._flush()
+        return self._points
+
+    @points.setter
+    def points(self, points):
+        self._flush()
+        self._points = points
+
+    def _default_center(self):
+        # 仿射變換保持重心，所以對原始重心套用待處理的變換即可
+        cx = sum(p.x for p in self._points) / 3
+        cy = sum(p.y for p in self._points) / 3
+        return self._current(Point(cx, cy))
+
+    def _apply(self, t):
+        for p in self._points:
+            t.move_point(p)
+
+    def __repr__(self):
+        return f"Triangle({self.points[0]}, {self.points[1]}, {self.points[2]})"
+
+def _as_xy(points):
+    """Point、PointArray、Point 串列或 (n, 2) 陣列都轉成 float64 的 (n, 2) 或 (2,) 陣列"""
+    if isinstance(points, PointArray):
+        return points.xy
+    if isinstance(points, Point):
+        return np.array([points.x, points.y], dtype=float)
+    if len(points) and isinstance(points[0], Point):
+        return np.array([[p.x, p.y] for p in points], dtype=float)
+    return np.asarray(points, dtype=float)
+
+class PointArray:
+    """
+    一整批點，座標存在一個連續的 (n, 2) float64 陣列 xy 中
+    translate / scale / rotate 都是對整個陣列做一次 NumPy 運算 (就地修改，和 Point 一樣)
+    center 可以是一個 Point，也可以是和點數一樣長的 PointArray / (n, 2) 陣列 (每個點各自的中心)
+    """
+    def __init__(self, points):
+        xy = _as_xy(points)
+        self.xy = np.array(xy, dtype=float).reshape(-1, 2)
+
+    @classmethod
+    def _view(cls, xy):
+        # 直接包住既有陣列 (不複製)，讓批次形狀的 p1、p2 等可以就地修改
+        out = cls.__new__(cls)
+        out.xy = xy
+        return out
+
+    @property
+    def x(self):
+        return self.xy[:, 0]
+
+    @property
+    def y(self):
+        return self.xy[:, 1]
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return Point(float(self.xy[index, 0]), float(self.xy[index, 1]))
+        return PointArray._view(self.xy[index])
+
+    def __repr__(self):
+        return f"PointArray({len(self)} points)"
+
+    def to_points(self):
+        return [Point(float(x), float(y)) for x, y in self.xy]
+
+    def centroid(self):
+        cx, cy = self.xy.mean(axis=0)
+        return Point(float(cx), float(cy))
+
+    def distance_to(self, other):
+        """到一個 Point 的距離，或和另一批同樣長度的點逐一配對的距離"""
+        d = self.xy - _as_xy(other)
+        return np.hypot(d[:, 0], d[:, 1])
+
     def translate(self, dx, dy):
-        self.p1.translate(dx, dy)
-        self.p2.translate(dx, dy)
+        self.xy += (dx, dy)
 
     def scale(self, factor, center=None):
-        self.p1.scale(factor, center)
-        self.p2.scale(factor, center)
+        if center is None:
+            self.xy *= factor
+            return
+        c = _as_xy(center)
+        self.xy -= c
+        self.xy *= factor
+        self.xy += c
+
+    def transform(self, t):
+        """一次套用整個 Transform (一次矩陣乘法)"""
+        self.xy[:] = t.apply_xy(self.xy)
 
     def rotate(self, angle_deg, center=None):
-        self.p1.rotate(angle_deg, center)
-        self.p2.rotate(angle_deg, center)
+        rad = math.radians(angle_deg)
+        cos_a = math.cos(rad)
+        sin_a = math.sin(rad)
+        # 列向量右乘 R^T，等同 (x cos - y sin, x sin + y cos)
+        rot = np.array([[cos_a, sin_a], [-sin_a, cos_a]])
+        if center is None:
+            self.xy[:] = self.xy @ rot
+            return
+        c = _as_xy(center)
+        self.xy[:] = (self.xy - c) @ rot + c
 
-class Circle:
-    def __init__(self, center, radius):
-        self.center = Point(center.x, center.y)
-        self.radius = radius
+class LineBatch:
+    """n 條線段：端點交錯存在同一個 PointArray (第 i 條為第 2i、2i+1 個點)"""
+    def __init__(self, p1, p2):
+        a, b = _as_xy(p1).reshape(-1, 2), _as_xy(p2).reshape(-1, 2)
+        self.points = PointArray(np.stack((a, b), axis=1))
+
+    @classmethod
+    def from_lines(cls, lines):
+        return cls([l.p1 for l in lines], [l.p2 for l in lines])
+
+    @property
+    def p1(self):
+        return self.points[0::2]
+
+    @property
+    def p2(self):
+        return self.points[1::2]
+
+    def __len__(self):
+        return len(self.points) // 2
+
+    def __getitem__(self, i):
+        return Line(self.points[2 * i], self.points[2 * i + 1])
 
     def __repr__(self):
-        return f"Circle(Center={self.center}, r={self.radius:.2f})"
+        return f"LineBatch({len(self)} lines)"
+
+    def get_coeffs(self):
+        """每條線的 A, B, C (A x + B y = C)，各為長度 n 的陣列"""
+        p1, p2 = self.p1.xy, self.p2.xy
+        A = p1[:, 1] - p2[:, 1]
+        B = p2[:, 0] - p1[:, 0]
+        C = A * p1[:, 0] + B * p1[:, 1]
+        return A, B, C
+
+    def transform(self, t):
+        self.points.transform(t)
 
     def translate(self, dx, dy):
-        self.center.translate(dx, dy)
+        self.points.translate(dx, dy)
 
     def scale(self, factor, center=None):
+        self.points.scale(factor, center)
+
+    def rotate(self, angle_deg, center=None):
+        self.points.rotate(angle_deg, center)
+
+class CircleBatch:
+    """n 個圓：圓心是一個 PointArray，半徑是長度 n 的陣列；沒給 center 時各自繞自己的圓心"""
+    def __init__(self, centers, radii):
+        self.centers = PointArray(centers)
+        self.radii = np.array(np.broadcast_to(np.asarray(radii, dtype=float), (len(self.centers),)))
+
+    @classmethod
+    def from_circles(cls, circles):
+        return cls([c.center for c in circles], [c.radius for c in circles])
+
+    def __len__(self):
+        return len(self.radii)
+
+    def __getitem__(self, i):
+        return Circle(self.centers[i], float(self.radii[i]))
+
+    def __repr__(self):
+        return f"CircleBatch({len(self)} circles)"
+
+    def transform(self, t):
+        self.centers.transform(t)
+        self.radii *= t.scale_factor()
 
-        self.radius *= factor
-        if center:
-            self.center.scale(factor, center)
+    def translate(self, dx, dy):
+        self.centers.translate(dx, dy)
+
+    def scale(self, factor, center=None):
+        self.radii *= factor
+        if center is not None:
+            self.centers.scale(factor, center)
 
     def rotate(self, angle_deg, center=None):
-      
-        if center:
-            self.center.rotate(angle_deg, center)
+        if center is not None:
+            self.centers.rotate(angle_deg, center)
 
-class Triangle:
+class TriangleBatch:
+    """n 個三角形：頂點依序存在同一個 PointArray (第 i 個為第 3i、3i+1、3i+2 個點)；沒給 center 時各自繞重心"""
     def __init__(self, p1, p2, p3):
-        self.points = [Point(p1.x, p1.y), Point(p2.x, p2.y), Point(p3.x, p3.y)]
+        vertices = [_as_xy(p).reshape(-1, 2) for p in (p1, p2, p3)]
+        self.points = PointArray(np.stack(vertices, axis=1))
+
+    @classmethod
+    def from_triangles(cls, triangles):
+        return cls(*([t.points[k] for t in triangles] for k in range(3)))
+
+    @property
+    def vertices(self):
+        """形狀為 (n, 3, 2) 的頂點陣列 (與 points 共用記憶體)"""
+        return self.points.xy.reshape(-1, 3, 2)
+
+    def __len__(self):
+        return len(self.points) // 3
+
+    def __getitem__(self, i):
+        return Triangle(*(self.points[3 * i + k] for k in range(3)))
 
     def __repr__(self):
-        return f"Triangle({self.points[0]}, {self.points[1]}, {self.points[2]})"
+        return f"TriangleBatch({len(self)} triangles)"
+
+    def centroids(self):
+        return PointArray(self.vertices.mean(axis=1))
+
+    def _centers(self, center):
+        if center is not None:
+            return center
+        return np.repeat(self.vertices.mean(axis=1), 3, axis=0)
+
+    def transform(self, t):
+        self.points.transform(t)
 
     def translate(self, dx, dy):
-        for p in self.points: p.translate(dx, dy)
+        self.points.translate(dx, dy)
 
     def scale(self, factor, center=None):
-
-        if center is None:
-            cx = sum(p.x for p in self.points) / 3
-            cy = sum(p.y for p in self.points) / 3
-            center = Point(cx, cy)
-        for p in self.points: p.scale(factor, center)
+        self.points.scale(factor, self._centers(center))
 
     def rotate(self, angle_deg, center=None):
-
-        if center is None:
-            cx = sum(p.x for p in self.points) / 3
-            cy = sum(p.y for p in self.points) / 3
-            center = Point(cx, cy)
-        for p in self.points: p.rotate(angle_deg, center)
+        self.points.rotate(angle_deg, self._centers(center))
 
 def intersect_line_line(l1, l2):
     A1, B1, C1 = l1.get_coeffs()
@@ -176,6 +518,461 @@ def intersect_circle_circle(c1, c2):
     
     return [Point(x3_1, y3_1), Point(x3_2, y3_2)]
 
+# 掃描線引擎用的相對誤差容許值 (乘上場景座標的尺度)
+SWEEP_TOL = 1e-9
+
+def _on_segment(q, line, tol):
+    return (min(line.p1.x, line.p2.x) - tol <= q.x <= max(line.p1.x, line.p2.x) + tol and
+            min(line.p1.y, line.p2.y) - tol <= q.y <= max(line.p1.y, line.p2.y) + tol)
+
+def _sweep_segments(segs, tol):
+    """
+    Bentley-Ottmann：回傳可能相交的線段配對 (i, j)
+    segs 為 (n, 4) 陣列 [x1, y1, x2, y2]，已旋轉到沒有垂直線段且 x1 < x2
+    事件依 (x, y) 排序；每個事件點把經過它的線段 (開始、結束、穿過) 一起處理，
+    所以多條線段共點、共用端點的情況也會一次報出所有配對
+    """
+    x1, y1, x2, y2 = (segs[:, k].tolist() for k in range(4))
+    slope = ((segs[:, 3] - segs[:, 1]) / (segs[:, 2] - segs[:, 0])).tolist()
+    starts, ends = {}, {}
+    heap, queued = [], set()
+
+    def push(pt):
+        if pt not in queued:
+            queued.add(pt)
+            heapq.heappush(heap, pt)
+
+    for i in range(len(segs)):
+        starts.setdefault((x1[i], y1[i]), []).append(i)
+        ends.setdefault((x2[i], y2[i]), []).append(i)
+        push((x1[i], y1[i]))
+        push((x2[i], y2[i]))
+
+    status = []
+    candidates = set()
+    sweep_x = 0.0
+
+    def y_at(s):
+        return y1[s] + slope[s] * (sweep_x - x1[s])
+
+    def check(a, b, px, py):
+        # 兩條線段相鄰時檢查是否相交，交點在目前事件之後才排入佇列
+        rx, ry = x2[a] - x1[a], y2[a] - y1[a]
+        sx, sy = x2[b] - x1[b], y2[b] - y1[b]
+        denom = rx * sy - ry * sx
+        if denom == 0:
+            return
+        qx, qy = x1[b] - x1[a], y1[b] - y1[a]
+        t = (qx * sy - qy * sx) / denom
+        u = (qx * ry - qy * rx) / denom
+        if -1e-12 <= t <= 1 + 1e-12 and -1e-12 <= u <= 1 + 1e-12:
+            candidates.add((a, b) if a < b else (b, a))
+            hx, hy = x1[a] + t * rx, y1[a] + t * ry
+            if hx > px + tol or (hx >= px - tol and hy > py + tol):
+                push((hx, hy))
+
+    while heap:
+        px, py = heapq.heappop(heap)
+        sweep_x = px
+        lo = bisect_left(status, py - tol, key=y_at)
+        hi = bisect_right(status, py + tol, key=y_at)
+        through = status[lo:hi]
+        upper = starts.pop((px, py), [])
+        lower = ends.pop((px, py), [])
+        group = set(through).union(upper, lower)
+        if len(group) > 1:
+            members = sorted(group)
+            candidates.update((a, b) for k, a in enumerate(members) for b in members[k + 1:])
+        del status[lo:hi]
+        for s in lower:
+            # 數值誤差讓結束的線段沒落在 [lo, hi) 時，直接從 status 移除
+            if s not in through:
+                index = status.index(s)
+                del status[index]
+                if index < lo:
+                    lo -= 1
+        keep = [s for s in through if s not in lower] + upper
+        keep.sort(key=lambda s: (slope[s], s))
+        status[lo:lo] = keep
+        if not keep:
+            if 0 < lo < len(status):
+                check(status[lo - 1], status[lo], px, py)
+        else:
+            if lo > 0:
+                check(status[lo - 1], keep[0], px, py)
+            if lo + len(keep) < len(status):
+                check(keep[-1], status[lo + len(keep)], px, py)
+    return candidates
+
+def _sweep_and_prune(boxes, n_skip=0):
+    """
+    依 x 區間排序後掃描，回傳外框 (xmin, ymin, xmax, ymax) 重疊的所有配對
+    前 n_skip 個外框彼此之間不配對 (例如線段之間已經由掃描線處理過)
+    仍在掃描範圍內的外框放在以 xmax 為鍵的 heap，過期的直接從堆頂移除
+    """
+    order = np.argsort(boxes[:, 0], kind="stable").tolist()
+    xmin, ymin, xmax, ymax = (boxes[:, k].tolist() for k in range(4))
+    skipped, active = [], []
+    pairs = []
+    for i in order:
+        for heap in (skipped, active):
+            while heap and heap[0][0] < xmin[i]:
+                heapq.heappop(heap)
+        candidates = active if i < n_skip else skipped + active
+        for _, j in candidates:
+            if ymin[i] <= ymax[j] and ymin[j] <= ymax[i]:
+                pairs.append((j, i) if j < i else (i, j))
+        heapq.heappush(skipped if i < n_skip else active, (xmax[i], i))
+    return pairs
+
+def find_all_intersections(shapes):
+    """
+    找出一整組 Line (視為線段) 與 Circle 之間的所有交點，回傳 [(i, j, Point), ...]，i < j 為 shapes 的索引
+    線段之間用 Bentley-Ottmann 掃描線挑出候選配對，圓與圓、圓與線段則用外框的 sweep-and-prune；
+    候選配對最後都交給 intersect_line_line / intersect_line_circle / intersect_circle_circle 算出交點
+    掃描前整個場景會先旋轉一個固定的小角度，讓原本的垂直線段不再垂直 (只影響掃描順序，不影響交點)
+    """
+    segments, circles = [], []
+    for i, shape in enumerate(shapes):
+        if isinstance(shape, Line):
+            if (shape.p1.x, shape.p1.y) != (shape.p2.x, shape.p2.y):
+                segments.append(i)
+        elif isinstance(shape, Circle):
+            circles.append(i)
+        else:
+            raise TypeError(f"Unsupported shape: {shape!r}")
+
+    coords = np.array([[shapes[i].p1.x, shapes[i].p1.y, shapes[i].p2.x, shapes[i].p2.y] for i in segments], dtype=float).reshape(-1, 4)
+    scale = max(1.0, float(np.abs(coords).max(initial=0.0)),
+                max((abs(shapes[i].center.x) + abs(shapes[i].center.y) + abs(shapes[i].radius) for i in circles), default=0.0))
+    tol = SWEEP_TOL * scale
+    results = []
+
+    def add(i, j, points, segment=None):
+        kept = []
+        for q in points:
+            if segment is not None and not _on_segment(q, segment, tol):
+                continue
+            if all(abs(q.x - k.x) > tol or abs(q.y - k.y) > tol for k in kept):
+                kept.append(q)
+        results.extend((i, j, q) for q in kept)
+
+    if segments:
+        angle = 0.5
+        rad = math.radians(angle)
+        cos_a, sin_a = math.cos(rad), math.sin(rad)
+        rotated = np.empty_like(coords)
+        rotated[:, 0::2] = coords[:, 0::2] * cos_a - coords[:, 1::2] * sin_a
+        rotated[:, 1::2] = coords[:, 0::2] * sin_a + coords[:, 1::2] * cos_a
+        # 讓每條線段都是左端點在前
+        flip = (rotated[:, 0] > rotated[:, 2]) | ((rotated[:, 0] == rotated[:, 2]) & (rotated[:, 1] > rotated[:, 3]))
+        rotated[flip] = rotated[flip][:, [2, 3, 0, 1]]
+        steep = rotated[:, 2] - rotated[:, 0] <= tol
+        sweep = np.flatnonzero(~steep)
+        pairs = {(int(sweep[a]), int(sweep[b])) for a, b in _sweep_segments(rotated[sweep], tol)}
+        # 旋轉後仍然 (幾乎) 垂直的線段很少見，直接和所有線段配對
+        for a in np.flatnonzero(steep).tolist():
+            pairs.update((min(a, b), max(a, b)) for b in range(len(segments)) if b != a)
+        for a, b in pairs:
+            i, j = segments[a], segments[b]
+            q = intersect_line_line(shapes[i], shapes[j])
+            if q is not None and _on_segment(q, shapes[i], tol):
+                add(i, j, [q], shapes[j])
+
+    if circles:
+        ids = segments + circles
+        boxes = np.array(
+            [[min(shapes[i].p1.x, shapes[i].p2.x), min(shapes[i].p1.y, shapes[i].p2.y),
+              max(shapes[i].p1.x, shapes[i].p2.x), max(shapes[i].p1.y, shapes[i].p2.y)] for i in segments] +
+            [[shapes[i].center.x - shapes[i].radius, shapes[i].center.y - shapes[i].radius,
+              shapes[i].center.x + shapes[i].radius, shapes[i].center.y + shapes[i].radius] for i in circles],
+            dtype=float)
+        boxes[:, :2] -= tol
+        boxes[:, 2:] += tol
+        n_seg = len(segments)
+        for a, b in _sweep_and_prune(boxes, n_seg):
+            i, j = ids[a], ids[b]
+            if a < n_seg:
+                points = intersect_line_circle(shapes[i], shapes[j])
+                add(min(i, j), max(i, j), points, shapes[i])
+            else:
+                add(min(i, j), max(i, j), intersect_circle_circle(shapes[i], shapes[j]))
+
+    results.sort(key=lambda r: (r[0], r[1]))
+    return results
+
+class SpatialIndex:
+    """
+    均勻網格的空間索引：每個格子記錄落在裡面的點編號，查詢只看附近的格子
+    可以用 Point 串列、PointArray 或 (n, 2) 陣列一次建好，之後再 insert / delete
+    點編號就是建立時的順序，insert 的點接著往後編
+    cell_size 沒給時取成平均每格約 2 個點
+    """
+    def __init__(self, points=(), cell_size=None):
+        xy = _as_xy(points).reshape(-1, 2) if len(points) else np.empty((0, 2))
+        n = len(xy)
+        if cell_size is None:
+            span = np.ptp(xy, axis=0) if n > 1 else np.zeros(2)
+            if span.max() > 0:
+                area = max(float(span[0] * span[1]), float(span.max()) ** 2 / n)
+                # 格子不能比座標的捨入誤差小太多，否則座標很大時 floor 出來的格子編號會溢位
+                magnitude = float(np.abs(xy).max())
+                cell_size = max(math.sqrt(2 * area / n), magnitude * np.finfo(float).eps * 1e6)
+            else:
+                # 只有一個點或所有點重合：看不出尺度，用 1
+                cell_size = 1.0
+        self.cell_size = cell_size
+        self._xy = np.array(xy, dtype=float)
+        self._alive = np.ones(n, dtype=bool)
+        self._size = n
+        self._count = n
+        self._cells = {}
+        self._bounds = None
+        if n:
+            keys = np.floor(self._xy / cell_size).astype(np.int64)
+            order = np.lexsort((keys[:, 1], keys[:, 0]))
+            sorted_keys = keys[order]
+            change = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+            bounds = np.concatenate(([0], change, [n])).tolist()
+            order = order.tolist()
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                self._cells[(int(sorted_keys[start, 0]), int(sorted_keys[start, 1]))] = order[start:end]
+            self._bounds = [int(keys[:, 0].min()), int(keys[:, 1].min()), int(keys[:, 0].max()), int(keys[:, 1].max())]
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"SpatialIndex({self._count} points, cell={self.cell_size:.3g})"
+
+    def _key(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def point(self, i):
+        return Point(float(self._xy[i, 0]), float(self._xy[i, 1]))
+
+    def insert(self, p):
+        """加入一個點，回傳它的編號"""
+        x, y = (p.x, p.y) if isinstance(p, Point) else p
+        i = self._size
+        if i == len(self._xy):
+            # 容量不夠時加倍，平均每次 insert 只搬 O(1) 個點
+            capacity = max(16, 2 * i)
+            xy = np.empty((capacity, 2))
+            xy[:i] = self._xy
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:i] = self._alive
+            self._xy, self._alive = xy, alive
+        self._xy[i] = (x, y)
+        self._alive[i] = True
+        self._size += 1
+        self._count += 1
+        key = self._key(x, y)
+        self._cells.setdefault(key, []).append(i)
+        if self._bounds is None:
+            self._bounds = [key[0], key[1], key[0], key[1]]
+        else:
+            b = self._bounds
+            b[0], b[1], b[2], b[3] = min(b[0], key[0]), min(b[1], key[1]), max(b[2], key[0]), max(b[3], key[1])
+        return i
+
+    def delete(self, i):
+        """刪除編號 i 的點；已刪除或不存在時丟 KeyError"""
+        if not (0 <= i < self._size) or not self._alive[i]:
+            raise KeyError(i)
+        key = self._key(*self._xy[i])
+        cell = self._cells[key]
+        cell.remove(i)
+        if not cell:
+            del self._cells[key]
+        self._alive[i] = False
+        self._count -= 1
+
+    def _gather(self, ix0, iy0, ix1, iy1):
+        ids = []
+        cells = self._cells
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(cells):
+            # 範圍比非空格子還多時，直接掃過所有非空格子
+            for (ix, iy), cell in cells.items():
+                if ix0 <= ix <= ix1 and iy0 <= iy <= iy1:
+                    ids.extend(cell)
+            return ids
+        for ix in range(ix0, ix1 + 1):
+            for iy in range(iy0, iy1 + 1):
+                cell = cells.get((ix, iy))
+                if cell:
+                    ids.extend(cell)
+        return ids
+
+    def rect(self, xmin, ymin, xmax, ymax):
+        """落在矩形 [xmin, xmax] x [ymin, ymax] 內的點編號 (由小到大)"""
+        ix0, iy0 = self._key(xmin, ymin)
+        ix1, iy1 = self._key(xmax, ymax)
+        ids = np.array(self._gather(ix0, iy0, ix1, iy1), dtype=np.int64)
+        xy = self._xy[ids]
+        inside = (xy[:, 0] >= xmin) & (xy[:, 0] <= xmax) & (xy[:, 1] >= ymin) & (xy[:, 1] <= ymax)
+        return np.sort(ids[inside])
+
+    def radius(self, p, r):
+        """與 p 距離不超過 r 的點編號 (由小到大)"""
+        x, y = (p.x, p.y) if isinstance(p, Point) else p
+        ix0, iy0 = self._key(x - r, y - r)
+        ix1, iy1 = self._key(x + r, y + r)
+        ids = np.array(self._gather(ix0, iy0, ix1, iy1), dtype=np.int64)
+        d = self._xy[ids] - (x, y)
+        return np.sort(ids[d[:, 0] ** 2 + d[:, 1] ** 2 <= r * r])
+
+    def knn(self, p, k=1):
+        """
+        最近的 k 個點，回傳 (編號, 距離) 兩個陣列，依距離排序
+        從 p 所在的格子 (p 在範圍外時從最近的一圈) 一圈一圈往外找，第 k 近的距離不超過已搜尋範圍的內切半徑就停
+        """
+        x, y = (p.x, p.y) if isinstance(p, Point) else p
+        if self._count == 0 or k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        cx, cy = self._key(x, y)
+        b = self._bounds
+        max_ring = max(abs(cx - b[0]), abs(cx - b[2]), abs(cy - b[1]), abs(cy - b[3]))
+        cells = self._cells
+        # p 在所有點的範圍外時，內側幾圈一定是空的，直接從碰到範圍的那一圈開始
+        ring = max(b[0] - cx, cx - b[2], b[1] - cy, cy - b[3], 0)
+        ids = self._gather(cx - ring, cy - ring, cx + ring, cy + ring)
+        while True:
+            if len(ids) >= k or ring >= max_ring:
+                cand = np.array(ids, dtype=np.int64)
+                d = np.hypot(self._xy[cand, 0] - x, self._xy[cand, 1] - y)
+                if len(cand) > k:
+                    part = np.argpartition(d, k - 1)[:k]
+                    cand, d = cand[part], d[part]
+                if ring >= max_ring or (len(cand) == k and d.max() <= ring * self.cell_size):
+                    order = np.argsort(d, kind="stable")
+                    return cand[order], d[order]
+            ring += 1
+            if (2 * ring + 1) ** 2 > len(cells):
+                # 範圍比非空格子還多時，跟 _gather 一樣直接掃過所有非空格子
+                ids = self._gather(cx - max_ring, cy - max_ring, cx + max_ring, cy + max_ring)
+                ring = max_ring
+                continue
+            for ix in range(cx - ring, cx + ring + 1):
+                for iy in (cy - ring, cy + ring):
+                    cell = cells.get((ix, iy))
+                    if cell:
+                        ids.extend(cell)
+            for iy in range(cy - ring + 1, cy + ring):
+                for ix in (cx - ring, cx + ring):
+                    cell = cells.get((ix, iy))
+                    if cell:
+                        ids.extend(cell)
+
+    def knn_batch(self, points, k=1):
+        """整批查詢最近的 k 個點，回傳 (m, k) 的編號與距離；點不夠時補 -1 與 inf"""
+        queries = _as_xy(points).reshape(-1, 2)
+        ids = np.full((len(queries), k), -1, dtype=np.int64)
+        dists = np.full((len(queries), k), np.inf)
+        for row, (x, y) in enumerate(queries.tolist()):
+            found, d = self.knn((x, y), k)
+            ids[row, :len(found)] = found
+            dists[row, :len(found)] = d
+        return ids, dists
+
+    def radius_batch(self, points, r):
+        """整批半徑查詢，回傳每個查詢點各自的編號陣列"""
+        return [self.radius((x, y), r) for x, y in _as_xy(points).reshape(-1, 2).tolist()]
+
+# 批次求交點時每一塊最多同時處理的配對數 (控制暫存陣列的記憶體)
+PAIR_BLOCK = 1 << 22
+
+def _pair_blocks(n_rows, n_cols):
+    step = max(1, PAIR_BLOCK // max(n_cols, 1))
+    for start in range(0, n_rows, step):
+        yield start, min(start + step, n_rows)
+
+def _sort_pairs(i, j, x, y):
+    order = np.lexsort((j, i))
+    return i[order], j[order], x[order], y[order]
+
+def intersect_circles_batch(circles, others=None, tol=1e-9):
+    """
+    兩組 CircleBatch 所有配對的交點 (others 為 None 時是同一組內 i < j 的配對)
+    回傳 (i, j, x, y) 四個陣列，每個交點一列；相切 (h <= tol) 的配對只有一列
+    規則同 intersect_circle_circle：同心圓或相離、內含都沒有交點
+    """
+    same = others is None
+    others = circles if same else others
+    c1, r1 = circles.centers.xy, circles.radii
+    c2, r2 = others.centers.xy, others.radii
+    out = []
+    for start, stop in _pair_blocks(len(r1), len(r2)):
+        dx = c2[None, :, 0] - c1[start:stop, None, 0]
+        dy = c2[None, :, 1] - c1[start:stop, None, 1]
+        # 先用距離平方篩選，只對真的相交的配對開根號
+        d2 = dx * dx + dy * dy
+        ra, rb = r1[start:stop, None], r2[None, :]
+        hit = (d2 <= (ra + rb + tol) ** 2) & (d2 > 0)
+        if same:
+            hit &= np.arange(start, stop)[:, None] < np.arange(len(r2))[None, :]
+        bi, bj = np.nonzero(hit)
+        if len(bi) == 0:
+            continue
+        dx, dy, d = dx[bi, bj], dy[bi, bj], np.sqrt(d2[bi, bj])
+        inside = d >= np.abs(r1[bi + start] - r2[bj]) - tol
+        bi, bj, dx, dy, d = bi[inside], bj[inside], dx[inside], dy[inside], d[inside]
+        gi = bi + start
+        ra, rb = r1[gi], r2[bj]
+        a = (ra ** 2 - rb ** 2 + d ** 2) / (2 * d)
+        h = np.sqrt(np.maximum(ra ** 2 - a ** 2, 0))
+        mx = c1[gi, 0] + a * dx / d
+        my = c1[gi, 1] + a * dy / d
+        ox, oy = h * dy / d, h * dx / d
+        two = h > tol
+        out.append((gi, bj, mx + ox, my - oy))
+        out.append((gi[two], bj[two], mx[two] - ox[two], my[two] + oy[two]))
+    if not out:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+    return _sort_pairs(*(np.concatenate(col) for col in zip(*out)))
+
+def intersect_lines_circles_batch(lines, circles, tol=1e-9, segment=False):
+    """
+    LineBatch 與 CircleBatch 所有配對的交點，回傳 (i, j, x, y)，i 為直線、j 為圓的編號
+    預設和 intersect_line_circle 一樣把直線視為無限長；segment=True 時只留線段上的交點
+    圓心到直線的距離與半徑相差不超過 tol 時視為相切，只回傳垂足一個點
+    """
+    p1, p2 = lines.p1.xy, lines.p2.xy
+    d = p2 - p1
+    length = np.hypot(d[:, 0], d[:, 1])
+    valid = np.flatnonzero(length > 0)
+    p1, d, length = p1[valid], d[valid], length[valid]
+    ux, uy = d[:, 0] / length, d[:, 1] / length
+    c, r = circles.centers.xy, circles.radii
+    out = []
+    for start, stop in _pair_blocks(len(valid), len(r)):
+        fx = c[None, :, 0] - p1[start:stop, None, 0]
+        fy = c[None, :, 1] - p1[start:stop, None, 1]
+        dist = np.abs(fx * uy[start:stop, None] - fy * ux[start:stop, None])
+        bi, bj = np.nonzero(dist <= r[None, :] + tol)
+        if len(bi) == 0:
+            continue
+        gi = bi + start
+        t0 = fx[bi, bj] * ux[gi] + fy[bi, bj] * uy[gi]
+        dist = dist[bi, bj]
+        half = np.sqrt(np.maximum(r[bj] ** 2 - dist ** 2, 0))
+        half[np.abs(dist - r[bj]) <= tol] = 0
+        two = half > 0
+        for sign, keep in ((-1, np.ones(len(gi), dtype=bool)), (1, two)):
+            t = t0[keep] + sign * half[keep]
+            li = gi[keep]
+            x = p1[li, 0] + t * ux[li]
+            y = p1[li, 1] + t * uy[li]
+            if segment:
+                on = (t >= -tol) & (t <= length[li] + tol)
+                li, x, y, cj = li[on], x[on], y[on], bj[keep][on]
+            else:
+                cj = bj[keep]
+            out.append((valid[li], cj, x, y))
+    if not out:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+    return _sort_pairs(*(np.concatenate(col) for col in zip(*out)))
+
 print("--- 幾何計算展示 ---")
 # 1. 兩直線交點
 l1 = Line(Point(0, 0), Point(4, 4))
@@ -226,3 +1023,27 @@ print(f"放大 2 倍後: {tri}")
 
 tri.rotate(90) # 預設繞重心旋轉
 print(f"旋轉 90 度後: {tri}")
+
+print("\n--- 批次幾何變換 (PointArray) ---")
+tris = TriangleBatch.from_triangles([Triangle(Point(0, 0), Point(4, 0), Point(0, 3)), Triangle(Point(1, 1), Point(2, 1), Point(1, 2))])
+tris.translate(1, 1)
+tris.scale(2)
+tris.rotate(90)
+print(f"批次處理後第一個三角形: {tris[0]}")
+print(f"各三角形重心: {tris.centroids().to_points()}")
+
+print("\n--- 場景中所有交點 (掃描線) ---")
+scene = [Line(Point(0, 0), Point(4, 4)), Line(Point(0, 4), Point(4, 0)), Line(Point(2, -1), Point(2, 5)), Circle(Point(2, 2), 2)]
+for i, j, q in find_all_intersections(scene):
+    print(f"形狀 {i} 與 {j}: {q}")
+
+print("\n--- 空間索引查詢 ---")
+index = SpatialIndex([Point(0, 0), Point(1, 1), Point(3, 4), Point(-2, 1), Point(5, 5)])
+ids, dists = index.knn(Point(2, 2), k=2)
+print(f"離 (2, 2) 最近的兩點: {[index.point(i) for i in ids]}, 距離 {dists.round(2).tolist()}")
+print(f"半徑 3 內的點編號: {index.radius(Point(0, 0), 3).tolist()}")
+
+print("\n--- 批次求交點 ---")
+batch = CircleBatch([Point(2, 2), Point(4, 2), Point(6, 2)], [2, 2, 2])
+for i, j, x, y in zip(*intersect_circles_batch(batch)):
+    print(f"圓 {i} 與圓 {j}: ({x:.2f}, {y:.2f})")
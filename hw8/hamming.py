@@ -1,21 +1,142 @@
-def hamming_74_simulation():
-    # 定義生成矩陣 G (4x7)
-    # 形式為 [I_4 | P]
-    G = np.array([
-        [1, 0, 0, 0, 1, 1, 0],
-        [0, 1, 0, 0, 1, 0, 1],
-        [0, 0, 1, 0, 0, 1, 1],
-        [0, 0, 0, 1, 1, 1, 1]
-    ])
-
-    # 定義同位檢查矩陣 H (3x7)
-    # 形式為 [P^T | I_3]
-    H = np.array([
-        [1, 1, 0, 1, 1, 0, 0],
-        [1, 0, 1, 1, 0, 1, 0],
-        [0, 1, 1, 1, 0, 0, 1]
-    ])
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+
+# 定義生成矩陣 G (4x7)
+# 形式為 [I_4 | P]
+G = np.array([
+    [1, 0, 0, 0, 1, 1, 0],
+    [0, 1, 0, 0, 1, 0, 1],
+    [0, 0, 1, 0, 0, 1, 1],
+    [0, 0, 0, 1, 1, 1, 1]
+])
+
+# 定義同位檢查矩陣 H (3x7)
+# 形式為 [P^T | I_3]
+H = np.array([
+    [1, 1, 0, 1, 1, 0, 0],
+    [1, 0, 1, 1, 0, 1, 0],
+    [0, 1, 1, 1, 0, 0, 1]
+])
+
+# 碼字以 7 bit 整數表示，第 0 個 bit (資料最高位) 放在最高位：c0 c1 ... c6
+_BIT_WEIGHTS = 1 << np.arange(6, -1, -1)
+_WORDS = (np.arange(128)[:, None] >> np.arange(6, -1, -1)) & 1
+
+# 編碼表：4 bit 訊息 -> 7 bit 碼字 (16 項)
+ENCODE_TABLE = ((((np.arange(16)[:, None] >> np.arange(3, -1, -1)) & 1) @ G % 2) @ _BIT_WEIGHTS).astype(np.uint16)
+
+# 症狀表：3 bit syndrome -> 要翻轉的 bit (8 項，0 表示沒有錯誤)
+SYNDROME_TABLE = np.zeros(8, dtype=np.uint16)
+SYNDROME_TABLE[H.T @ np.array([4, 2, 1])] = 1 << np.arange(6, -1, -1)
+
+# 由上面兩張表展開成以「一個位元組 = 兩個 nibble」為單位的表，一次查表處理 8 bit 資料 / 14 bit 碼字
+_SYNDROMES = (_WORDS @ H.T % 2) @ np.array([4, 2, 1])
+_NIBBLE = ((np.arange(128) ^ SYNDROME_TABLE[_SYNDROMES]) >> 3).astype(np.uint8)
+_FLAGGED = (_SYNDROMES != 0).astype(np.uint8)
+_PAIR = np.arange(1 << 14)
+_ENCODE_BYTE = ((ENCODE_TABLE[np.arange(256) >> 4].astype(np.uint64) << np.uint64(7)) | ENCODE_TABLE[np.arange(256) & 15])
+_DECODE_PAIR = ((_NIBBLE[_PAIR >> 7] << 4) | _NIBBLE[_PAIR & 127]).astype(np.uint8)
+_CORRECTED_PAIR = _FLAGGED[_PAIR >> 7] + _FLAGGED[_PAIR & 127]
+
+# 4 個位元組 = 8 個碼字 = 56 bit = 7 個位元組，整組剛好對齊
+_SHIFTS = np.array([50, 36, 22, 8], dtype=np.uint64)
+
+# 一次處理的資料量 (bytes)，讓暫存陣列留在快取裡；必須是 4 的倍數
+BLOCK_SIZE = 1 << 16
+
+def _encode_block(buf):
+    n = len(buf)
+    pad = -n % 4
+    if pad:
+        buf = np.concatenate((buf, np.zeros(pad, dtype=np.uint8)))
+    pairs = _ENCODE_BYTE[buf].reshape(-1, 4)
+    words = pairs[:, 0] << _SHIFTS[0]
+    for k in range(1, 4):
+        words |= pairs[:, k] << _SHIFTS[k]
+    out = words.astype(">u8").view(np.uint8).reshape(-1, 8)[:, :7]
+    return out.tobytes()[:(14 * n + 7) // 8]
+
+def _decode_block(buf):
+    n = 8 * len(buf) // 14
+    groups = -(-len(buf) // 7)
+    flat = np.zeros(groups * 7, dtype=np.uint8)
+    flat[:len(buf)] = buf
+    block = np.zeros((groups, 8), dtype=np.uint8)
+    block[:, :7] = flat.reshape(-1, 7)
+    words = block.view(">u8").reshape(-1).astype(np.uint64)
+    pairs = np.empty((groups, 4), dtype=np.intp)
+    for k in range(4):
+        pairs[:, k] = (words >> _SHIFTS[k]) & np.uint64(0x3FFF)
+    pairs = pairs.reshape(-1)[:n]
+    return _DECODE_PAIR[pairs].tobytes(), int(_CORRECTED_PAIR[pairs].sum())
+
+def encode(data):
+    """
+    把位元組資料編成 Hamming(7,4) 碼，每個位元組拆成高低兩個 nibble，碼字緊密排列 (每 4 bytes 變 7 bytes)
+    回傳長度為 ceil(14n / 8) 的 bytes
+    """
+    buf = np.frombuffer(bytes(data), dtype=np.uint8)
+    return b"".join(_encode_block(buf[i:i + BLOCK_SIZE]) for i in range(0, len(buf), BLOCK_SIZE))
+
+def decode(data):
+    """
+    解碼 encode 的輸出，每個碼字用症狀表更正至多 1 bit 錯誤
+    回傳 (原始資料 bytes, 更正的碼字數)
+    """
+    buf = np.frombuffer(bytes(data), dtype=np.uint8)
+    step = BLOCK_SIZE // 4 * 7
+    parts, corrections = [], 0
+    for i in range(0, len(buf), step):
+        decoded, fixed = _decode_block(buf[i:i + step])
+        parts.append(decoded)
+        corrections += fixed
+    return b"".join(parts), corrections
 
+def _open(f, mode):
+    return (open(f, mode), True) if isinstance(f, (str, bytes)) or hasattr(f, "__fspath__") else (f, False)
+
+def encode_file(src, dst, chunk_size=1 << 20):
+    """串流編碼：每次讀 chunk_size (取 4 的倍數) 個位元組，記憶體用量固定；src、dst 可以是路徑或二進位檔案物件"""
+    chunk_size = max(4, chunk_size - chunk_size % 4)
+    fin, close_in = _open(src, "rb")
+    fout, close_out = _open(dst, "wb")
+    try:
+        while True:
+            chunk = fin.read(chunk_size)
+            if not chunk:
+                break
+            fout.write(encode(chunk))
+    finally:
+        if close_in:
+            fin.close()
+        if close_out:
+            fout.close()
+
+def decode_file(src, dst, chunk_size=7 << 18):
+    """串流解碼：每次讀 chunk_size (取 7 的倍數) 個位元組，回傳總共更正的碼字數"""
+    chunk_size = max(7, chunk_size - chunk_size % 7)
+    fin, close_in = _open(src, "rb")
+    fout, close_out = _open(dst, "wb")
+    corrections = 0
+    try:
+        while True:
+            chunk = fin.read(chunk_size)
+            if not chunk:
+                break
+            decoded, fixed = decode(chunk)
+            fout.write(decoded)
+            corrections += fixed
+    finally:
+        if close_in:
+            fin.close()
+        if close_out:
+            fout.close()
+    return corrections
+
+def hamming_74_simulation():
     # 1. 編碼 (Encoding)
     original_data = np.array([1, 0, 1, 1]) # 4 bits 訊息
     # codeword = data * G (模 2 運算)
@@ -59,4 +180,88 @@ def hamming_74_simulation():
     else:
         print("未偵測到錯誤")
 
-hamming_74_simulation()
+
+def _popcount_table():
+    return _WORDS.sum(axis=1).astype(np.int64)
+
+_POPCOUNT = _popcount_table()
+
+def _ber_chunk(p_flip, n, seed):
+    """
+    一個 chunk 的模擬：n 個隨機 4 bit 訊息編碼後通過翻轉機率 p_flip 的二元對稱信道，再用症狀表解碼
+    回傳 (信道翻轉的 bit 數, 解碼後錯誤的資料 bit 數, 解碼錯誤的碼字數)
+    """
+    rng = np.random.default_rng(seed)
+    messages = rng.integers(0, 16, n, dtype=np.uint8)
+    codewords = ENCODE_TABLE[messages]
+    flips = rng.random((n, 7), dtype=np.float32) < p_flip
+    errors = np.packbits(flips, axis=1)[:, 0] >> 1
+    decoded = _NIBBLE[codewords ^ errors]
+    wrong = _POPCOUNT[decoded ^ messages]
+    return int(_POPCOUNT[errors].sum()), int(wrong.sum()), int(np.count_nonzero(wrong))
+
+def wilson_interval(k, n, confidence=0.95):
+    """二項比例 k / n 的 Wilson 信賴區間"""
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    phat = k / n
+    denom = 1 + z * z / n
+    center = (phat + z * z / (2 * n)) / denom
+    half = z * math.sqrt(phat * (1 - phat) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+def simulate_ber(p_flip_values, n_codewords, chunk_size=1 << 18, workers=None, seed=None, confidence=0.95):
+    """
+    Hamming(7,4) 在二元對稱信道上的 Monte Carlo 位元錯誤率
+    每個 p 模擬 n_codewords 個碼字，切成 chunk_size 大小的 chunk 分給 process pool；
+    每個 chunk 用 SeedSequence.spawn 得到獨立的亂數串流，同一個 seed 的結果與 workers 數無關
+    workers 為 1 時直接在目前的 process 跑
+    回傳每個 p 一個 dict：pre_ber (信道 BER)、post_ber (解碼後資料 BER)、wer (碼字錯誤率) 與各自的 Wilson 區間
+    解碼後的錯誤 bit 會集中在同一個碼字裡，所以 post_ber 的區間偏窄，wer 的區間才是獨立試驗
+    """
+    p_flip_values = list(p_flip_values)
+    tasks = []
+    for k, p in enumerate(p_flip_values):
+        for start in range(0, n_codewords, chunk_size):
+            tasks.append((k, p, min(chunk_size, n_codewords - start)))
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    if workers is None:
+        workers = os.cpu_count() or 1
+    totals = np.zeros((len(p_flip_values), 3), dtype=np.int64)
+    if workers <= 1 or len(tasks) == 1:
+        counts = [_ber_chunk(p, n, s) for (_, p, n), s in zip(tasks, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = list(pool.map(_ber_chunk, [t[1] for t in tasks], [t[2] for t in tasks], seeds))
+    for (k, _, _), c in zip(tasks, counts):
+        totals[k] += c
+    results = []
+    for k, p in enumerate(p_flip_values):
+        channel_bits, data_bits = 7 * n_codewords, 4 * n_codewords
+        pre, post, words = (int(v) for v in totals[k])
+        results.append({
+            "p": p,
+            "codewords": n_codewords,
+            "pre_ber": pre / channel_bits,
+            "pre_ci": wilson_interval(pre, channel_bits, confidence),
+            "post_ber": post / data_bits,
+            "post_ci": wilson_interval(post, data_bits, confidence),
+            "wer": words / n_codewords,
+            "wer_ci": wilson_interval(words, n_codewords, confidence),
+        })
+    return results
+
+if __name__ == "__main__":
+    hamming_74_simulation()
+
+    message = "Hamming(7,4)".encode()
+    encoded = bytearray(encode(message))
+    encoded[3] ^= 0b00010000 # 翻轉一個 bit
+    decoded, fixed = decode(bytes(encoded))
+    print(f"\n位元組編解碼: {message} -> {len(encoded)} bytes -> {decoded}, 更正 {fixed} 個碼字")
+
+    print("\n--- 二元對稱信道 BER 模擬 ---")
+    for r in simulate_ber([0.1, 0.01, 0.001], 1_000_000, seed=0):
+        print(f"p = {r['p']:<6} 解碼前 BER = {r['pre_ber']:.3e}  解碼後 BER = {r['post_ber']:.3e} "
+              f"[{r['post_ci'][0]:.3e}, {r['post_ci'][1]:.3e}]")
@@ -1,34 +1,144 @@
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
-def info_theory_metrics():
-    # 為了避免 log(0)，我們加上一個極小值 epsilon
-    eps = 1e-15
-
-    def entropy(p):
-        """熵 H(p)"""
-        return -np.sum(p * np.log2(p + eps))
-
-    def cross_entropy(p, q):
-        """交叉熵 H(p, q)"""
-        return -np.sum(p * np.log2(q + eps))
-
-    def kl_divergence(p, q):
-        """KL 散度 D_KL(p || q) = H(p, q) - H(p)"""
-        return np.sum(p * np.log2((p + eps) / (q + eps)))
-
-    def mutual_information(pxy, px, py):
-        """
-        互資訊 I(X;Y)
-        pxy: 聯合機率分佈
-        px, py: 邊際機率分佈
-        """
-        mi = 0
-        for i in range(len(px)):
-            for j in range(len(py)):
-                if pxy[i][j] > 0:
-                    mi += pxy[i][j] * np.log2(pxy[i][j] / (px[i] * py[j]))
-        return mi
+def _log2(x, mask):
+    # 只對 mask 為 True 的位置取 log，其餘填 0，避免 log(0) 的警告與 epsilon 造成的偏差
+    with np.errstate(divide="ignore"):
+        return np.where(mask, np.log2(np.where(mask, x, 1.0)), 0.0)
+
+def entropy(p, axis=-1):
+    """熵 H(p)，沿 axis 加總 (0 log 0 視為 0)；axis=None 時對所有元素加總"""
+    p = np.asarray(p, dtype=float)
+    return 0.0 - np.sum(p * _log2(p, p > 0), axis=axis)
+
+def cross_entropy(p, q, axis=-1):
+    """交叉熵 H(p, q)；p > 0 但 q = 0 的位置結果為 inf"""
+    p, q = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(q, dtype=float))
+    return 0.0 - np.sum(p * _log2(q, p > 0), axis=axis)
+
+def kl_divergence(p, q, axis=-1):
+    """KL 散度 D_KL(p || q) = H(p, q) - H(p)，只加總 p > 0 的項；p > 0 但 q = 0 時為 inf"""
+    p, q = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(q, dtype=float))
+    support = p > 0
+    return np.sum(p * (_log2(p, support) - _log2(q, support)), axis=axis)
+
+def mutual_information(pxy, px=None, py=None, axis=(-2, -1)):
+    """
+    互資訊 I(X;Y)
+    pxy: 聯合機率分佈，axis 指定 X、Y 所在的兩個軸，其餘的軸視為一批分佈
+    px, py: 邊際機率分佈，沒給時由 pxy 加總得到
+    """
+    pxy = np.moveaxis(np.asarray(pxy, dtype=float), axis, (-2, -1))
+    px = pxy.sum(axis=-1) if px is None else np.asarray(px, dtype=float)
+    py = pxy.sum(axis=-2) if py is None else np.asarray(py, dtype=float)
+    return kl_divergence(pxy, px[..., :, None] * py[..., None, :], axis=(-2, -1))
+
+class JointHistogram:
+    """
+    串流式的聯合直方圖：資料分批 update，記憶體只有 nx * ny 個計數
+    x_bins / y_bins 為整數時，樣本是 0 .. n-1 的類別；為陣列時視為 bin 邊界 (同 np.histogram2d)，
+    超出範圍的樣本不計入，數量記在 dropped
+    """
+    def __init__(self, x_bins, y_bins):
+        self.x_edges = None if np.ndim(x_bins) == 0 else np.asarray(x_bins, dtype=float)
+        self.y_edges = None if np.ndim(y_bins) == 0 else np.asarray(y_bins, dtype=float)
+        self.nx = int(x_bins) if self.x_edges is None else len(self.x_edges) - 1
+        self.ny = int(y_bins) if self.y_edges is None else len(self.y_edges) - 1
+        self.counts = np.zeros((self.nx, self.ny), dtype=np.int64)
+        self.dropped = 0
+
+    @staticmethod
+    def _index(values, n, edges):
+        values = np.asarray(values).ravel()
+        if edges is None:
+            index = values.astype(np.int64)
+            return index, (index >= 0) & (index < n) & (index == values)
+        index = np.searchsorted(edges, values, side="right") - 1
+        # 最右邊的邊界本身算進最後一個 bin (同 np.histogram)
+        index[values == edges[-1]] = n - 1
+        return index, (index >= 0) & (index < n)
+
+    def update(self, x, y):
+        """加入一批成對的樣本 (x, y)"""
+        xi, x_ok = self._index(x, self.nx, self.x_edges)
+        yi, y_ok = self._index(y, self.ny, self.y_edges)
+        if len(xi) != len(yi):
+            raise ValueError("x and y must have the same number of samples")
+        ok = x_ok & y_ok
+        self.dropped += int(len(ok) - np.count_nonzero(ok))
+        flat = xi[ok] * self.ny + yi[ok]
+        self.counts += np.bincount(flat, minlength=self.nx * self.ny).reshape(self.nx, self.ny)
+        return self
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def joint(self):
+        """目前的聯合機率分佈 (還沒有樣本時全為 0)"""
+        total = self.counts.sum()
+        return self.counts / total if total else np.zeros(self.counts.shape)
+
+    def entropy_x(self):
+        return entropy(self.joint().sum(axis=1))
+
+    def entropy_y(self):
+        return entropy(self.joint().sum(axis=0))
+
+    def joint_entropy(self):
+        return entropy(self.joint(), axis=None)
 
+    def mutual_information(self):
+        return mutual_information(self.joint())
+
+# pairwise_* 每個 tile 的暫存陣列大小上限 (bytes)
+PAIRWISE_MEMORY_BUDGET = 64 << 20
+
+def _tiles(n, m, budget):
+    cols = min(m, max(1, int(np.sqrt(budget / 8))))
+    rows = min(n, max(1, budget // (8 * cols)))
+    return [(i, min(i + rows, n), j, min(j + cols, m)) for i in range(0, n, rows) for j in range(0, m, cols)]
+
+def pairwise_cross_entropy(P, Q, memory_budget=PAIRWISE_MEMORY_BUDGET, workers=1):
+    """
+    所有配對的交叉熵 H(P_i, Q_j)，回傳 n x m 矩陣 (P 為 n x k，Q 為 m x k，每一列是一個分佈)
+    log Q 只算一次，之後每個 tile 都是一次矩陣乘法 -P log2(Q)^T
+    Q_j 在 P_i 的支撐集上有 0 時結果為 inf，和 cross_entropy 相同
+    memory_budget 限制每個 tile 的暫存大小；workers > 1 時用 thread pool 分攤 tile (矩陣乘法會釋放 GIL)
+    """
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    Q = np.atleast_2d(np.asarray(Q, dtype=float))
+    if P.shape[1] != Q.shape[1]:
+        raise ValueError("P and Q must have the same number of bins")
+    zero = Q <= 0
+    logq_t = np.ascontiguousarray(_log2(Q, ~zero).T)
+    # 只有 Q 有 0 時才需要另外檢查 P > 0、Q = 0 的配對
+    support = (P > 0).astype(float) if zero.any() else None
+    zero_t = np.ascontiguousarray(zero.T, dtype=float) if support is not None else None
+    result = np.empty((len(P), len(Q)))
+
+    def run(tile):
+        i0, i1, j0, j1 = tile
+        block = -(P[i0:i1] @ logq_t[:, j0:j1])
+        if support is not None:
+            block[support[i0:i1] @ zero_t[:, j0:j1] > 0] = np.inf
+        result[i0:i1, j0:j1] = block
+
+    tiles = _tiles(len(P), len(Q), memory_budget)
+    if workers > 1 and len(tiles) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, tiles))
+    else:
+        for tile in tiles:
+            run(tile)
+    return result + 0.0
+
+def pairwise_kl(P, Q, memory_budget=PAIRWISE_MEMORY_BUDGET, workers=1):
+    """所有配對的 KL 散度 D_KL(P_i || Q_j) = H(P_i, Q_j) - H(P_i)，回傳 n x m 矩陣"""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    return pairwise_cross_entropy(P, Q, memory_budget, workers) - entropy(P)[:, None]
+
+def info_theory_metrics():
     # --- 驗證資料 ---
     # 定義兩個不同的機率分佈
     p = np.array([0.8, 0.1, 0.1]) # 真實分佈
@@ -53,6 +163,22 @@ def info_theory_metrics():
     mi_val = mutual_information(p_xy, p_x, p_y)
     print(f"4. 互資訊 I(X;Y): {mi_val:.4f} bits")
 
+    # 一批分佈一次計算 (沿最後一個軸)
+    batch = np.array([p, q, [1/3, 1/3, 1/3]])
+    print(f"5. 一批分佈的熵: {np.round(entropy(batch), 4)}")
+
+    # 串流式估計：資料分批進來，只累積聯合直方圖
+    rng = np.random.default_rng(0)
+    hist = JointHistogram(2, 2)
+    for _ in range(10):
+        x = rng.integers(0, 2, 100_000)
+        y = np.where(rng.random(100_000) < 0.9, x, 1 - x) # y 有 90% 機率等於 x
+        hist.update(x, y)
+    print(f"6. 串流估計 I(X;Y) ({hist.n} 個樣本): {hist.mutual_information():.4f} bits")
+
+    # 兩兩之間的 KL 散度矩陣
+    print(f"7. 兩兩 KL 散度矩陣:\n{np.round(pairwise_kl(batch, batch), 4)}")
+
     # --- 驗證 Inequality ---
     print("\n--- 驗證 Cross Entropy 不等式 ---")
     print(f"H(P, P) = {h_p:.4f}")
@@ -64,4 +190,5 @@ def info_theory_metrics():
     else:
         print("驗證失敗")
 
-info_theory_metrics()
+if __name__ == "__main__":
+    info_theory_metrics()